@@ -0,0 +1,55 @@
+package com.chirimen.dispersionindicator
+{
+    import flash.display.Graphics;
+    import flash.display.Shape;
+    import flash.display.Sprite;
+
+    /**
+     * ...
+     * @author Chirimen
+     */
+    public class GraphContainer extends Sprite
+    {
+        public var fieldWidth:int = 0;
+        public var fieldHeight:int = 0;
+        private var lineWidth:Number = 1;
+        private var colors:Object = {};
+
+        public function GraphContainer(graph:Object) : void
+        {
+            super();
+
+            fieldWidth = graph.width;
+            fieldHeight = graph.height;
+            lineWidth = graph.lineWidth;
+            graphics.lineStyle(1, graph.frameColor, 0.5);
+            graphics.drawRect(0, 0, fieldWidth, fieldHeight);
+            for each (var s:Object in graph.series) {
+                var shape:Shape = new Shape();
+                shape.name = s.name;
+                addChild(shape);
+                colors[s.name] = s.color;
+            }
+        }
+
+        /**
+         * points are pixel coordinates already reduced on the Python side: [x0, y0, x1, y1, ...]
+         */
+        public function setGraph(name:String, points:Array) : void
+        {
+            var shape:Shape = getChildByName(name) as Shape;
+            if (shape == null)
+                return;
+            var g:Graphics = shape.graphics;
+            g.clear();
+            if (points == null || points.length < 4)
+                return;
+            g.lineStyle(lineWidth, colors[name]);
+            g.moveTo(points[0], points[1]);
+            for (var i:int = 2; i < points.length; i += 2) {
+                g.lineTo(points[i], points[i + 1]);
+            }
+        }
+    }
+
+}
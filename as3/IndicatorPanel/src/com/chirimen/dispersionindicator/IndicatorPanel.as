@@ -29,7 +29,7 @@ package com.chirimen.dispersionindicator
             DebugUtils.LOG_DEBUG("%s: %s", className, "as_setConfig");
             _config = settings.stats;
             _style = settings.style;
-            panel = new PanelContainer(_config, _style);
+            panel = new PanelContainer(_config, _style, settings.hasOwnProperty("graph") ? settings.graph : null);
             panel.visible = false;
             addChild(panel);
         }
@@ -37,8 +37,18 @@ package com.chirimen.dispersionindicator
         public function as_setValue(name:String = null, text:String = null) : void
         {
             //DebugUtils.LOG_DEBUG("%s: %s", className, "as_setValue");
-            var child:LineContainer = panel.getChildByName(name) as LineContainer;
-            child.valueField.text = text;
+            panel.setValue(name, text);
+        }
+
+        public function as_setValues(values:Object = null) : void
+        {
+            //DebugUtils.LOG_DEBUG("%s: %s", className, "as_setValues");
+            panel.setValues(values);
+        }
+
+        public function as_setGraph(name:String = null, points:Array = null) : void
+        {
+            panel.setGraph(name, points);
         }
 
         public function as_setPosition(x:int = 0, y:int = 0) : void
@@ -6,6 +6,7 @@ package com.chirimen.dispersionindicator
 
     import com.chirimen.dispersionindicator.LineContainer;
     import com.chirimen.dispersionindicator.LineAlign;
+    import com.chirimen.dispersionindicator.GraphContainer;
 	
     /**
      * ...
@@ -15,8 +16,9 @@ package com.chirimen.dispersionindicator
     {
         public var fieldWidth:int = 0;
         public var fieldHeight:int = 0;
+        private var graph:GraphContainer = null;
 
-        public function PanelContainer(config:Array, style:Object) : void
+        public function PanelContainer(config:Array, style:Object, graphConfig:Object = null) : void
         {
             super();
 			
@@ -72,11 +74,39 @@ package com.chirimen.dispersionindicator
                 line = getChildAt(i) as LineContainer;
                 fieldWidth = Math.max(fieldWidth, line.x + line.width + style.paddingRight);
             }
+            if (graphConfig != null) {
+                graph = new GraphContainer(graphConfig);
+                graph.x = style.paddingLeft;
+                graph.y = numChildren > 0 ? fieldHeight - style.paddingBottom : style.paddingTop;
+                addChild(graph);
+                fieldHeight = graph.y + graph.fieldHeight + style.paddingBottom;
+                fieldWidth = Math.max(fieldWidth, graph.x + graph.fieldWidth + style.paddingRight);
+            }
             setBackground(style);
             setFilter(style);
             alpha = style.alpha;
         }
 
+        public function setValue(name:String, text:String) : void
+        {
+            var line:LineContainer = getChildByName(name) as LineContainer;
+            if (line != null)
+                line.valueField.text = text;
+        }
+
+        public function setValues(values:Object) : void
+        {
+            for (var name:String in values) {
+                setValue(name, values[name]);
+            }
+        }
+
+        public function setGraph(name:String, points:Array) : void
+        {
+            if (graph != null)
+                graph.setGraph(name, points);
+        }
+
         private function setBackground(style:Object) : void
         {
             if (style.hasOwnProperty("backgroundColor")) {
@@ -95,7 +125,8 @@ package com.chirimen.dispersionindicator
                     var filters:Array = [ dropShadow ];
                     for (var i:int = 0; i < numChildren; i++) {
                         var line:LineContainer = getChildAt(i) as LineContainer;
-                        line.setFilters(filters);
+                        if (line != null)
+                            line.setFilters(filters);
                     }
                 }
             }
@@ -0,0 +1,87 @@
+"""Per-frame cost of the StatsCollector update methods and the client hooks.
+
+Runs a synthetic battle (framegen.py) against the fake client and reports
+microseconds per frame. Only the call itself is timed, the frame scripting
+in between is not; the overhead of the timer is measured and subtracted.
+
+usage: python2 benchmark/bench_collector.py [frames]
+"""
+import sys
+import timeit
+
+import headless
+import fakeclient
+
+
+def measure(battle, frames, func, repeat=5):
+    step = battle.step
+    timer = timeit.default_timer
+    best = None
+    for _ in range(repeat):
+        elapsed = 0.0
+        for i in range(frames):
+            step(i)
+            start = timer()
+            func()
+            elapsed += timer() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / frames
+
+
+def main(frames=2000):
+    frames = int(frames)
+    clock = headless.installClient()
+    from framegen import FrameGenerator
+    from dispersionindicator.mod_constants import FRAME_COLLECTORS
+    from dispersionindicator import statscollector
+
+    battle = FrameGenerator(clock)
+    collector = battle.start()
+    avatar = battle.avatar
+    for i in range(120):
+        battle.step(i)
+        battle.runFrame()
+
+    info = { 'entityType': 'Vehicle', 'entityVDesc': battle.target.typeDescriptor }
+    percent = statscollector.computePenetration(battle.hitPoint, battle.direction, battle.target,
+        avatar.getVehicleDescriptor(), 300.0, 1.0, info)
+
+    def uncachedPenetration():
+        collector.penetrationCache.clear()
+        battle.crosshairDataProxy.setGunMarkerState(0, (battle.hitPoint, battle.direction, battle.collData))
+
+    methods = []
+    for name in FRAME_COLLECTORS:
+        method = getattr(collector, name)
+        if name == 'updateDispersionAngle':
+            methods.append((name, lambda m=method: m(avatar, avatar.dispersionAngle, 0.0, 0)))
+        else:
+            methods.append((name, lambda m=method: m(avatar)))
+    methods.extend([
+        ('updateShotInfo',          lambda: collector.updateShotInfo(avatar, battle.hitPoint)),
+        ('updatePenetrationArmor',  lambda: collector.updatePenetrationArmor(percent, info)),
+        ('updatePing',              collector.updatePing)
+    ])
+    hooks = [
+        ('dispersion angle hook',   lambda: avatar.getOwnVehicleShotDispersionAngle(0.0)),
+        ('gun marker hook',         lambda: battle.gunControlMode.updateGunMarker(0, fakeclient.GunMarkerInfo(battle.hitPoint, battle.direction, 0.0), None, 0.0)),
+        ('penetration hook',        lambda: battle.crosshairDataProxy.setGunMarkerState(0, (battle.hitPoint, battle.direction, battle.collData))),
+        ('penetration hook, no cache', uncachedPenetration),
+        ('full frame',              battle.runFrame)
+    ]
+
+    baseline = measure(battle, frames, lambda: None)
+    print('frames: {}, timer overhead: {:.2f} us/frame'.format(frames, baseline * 1e6))
+    for title, entries in [ ('StatsCollector', methods), ('hooks', hooks) ]:
+        print('')
+        print('{:32s} {:>10s}'.format(title, 'us/frame'))
+        for name, func in entries:
+            cost = measure(battle, frames, func) - baseline
+            print('{:32s} {:10.2f}'.format(name, cost * 1e6))
+    cache = collector.penetrationCache
+    print('')
+    print('penetration cache: hits={}, misses={}'.format(cache.hits, cache.misses))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,111 @@
+"""Per-update cost of formatting every stat of every panel in a config.
+
+Compares the compiled accessors of StatsIndicatorMeta with the previous
+per-call lookup (dict lookup, getattr, factor, format, MINUS_ZERO).
+
+usage: python2 benchmark/bench_statsindicator.py [config-full.json]
+"""
+import sys
+import json
+import timeit
+
+import headless
+
+
+class LegacyStatsTable(object):
+    """The lookup StatsIndicatorMeta did on every call before compilation."""
+    def __init__(self, meta, config, clientStatus):
+        from dispersionindicator.mod_constants import CONSTANT
+        self.vehicleStats = clientStatus
+        self.items = config['items']
+        self.statsTable = {}
+        for key in config['items']:
+            statDef = config['statsDefs'].get(key, None)
+            if statDef is None:
+                continue
+            self.statsTable[key] = desc = {}
+            for tag in ['status', 'title', 'label', 'unit', 'format']:
+                if tag in statDef:
+                    desc[tag] = statDef[tag]
+            factor = statDef.get('factor', None)
+            if isinstance(factor, basestring):
+                factor = CONSTANT.get(factor, None)
+            if factor is not None:
+                desc['factor'] = factor
+
+    def getStatus(self, name):
+        desc = self.statsTable.get(name, None)
+        statusName = desc['status'] if desc is not None else name
+        value = getattr(self.vehicleStats, statusName, None)
+        if value is None:
+            return None
+        if desc is not None and 'factor' in desc:
+            value *= desc['factor']
+        return value
+
+    def getStatusAsText(self, name):
+        from dispersionindicator.statsindicator import MINUS_ZERO
+        desc = self.statsTable.get(name, {})
+        template = desc.get('format', None)
+        value = self.getStatus(name)
+        if value is None:
+            return ''
+        if template is not None:
+            try:
+                text = template.format(value)
+                text = MINUS_ZERO.sub(r'\1', text)
+            except:
+                text = str(value)
+        else:
+            text = str(value)
+        return text
+
+    def update(self):
+        return [ self.getStatusAsText(name) for name in self.items ]
+
+
+def makeSampleStatus():
+    from dispersionindicator.mod_constants import CLIENT_STATUS_LIST
+    class SampleStatus(object):
+        __slots__ = CLIENT_STATUS_LIST
+    status = SampleStatus()
+    for i, name in enumerate(CLIENT_STATUS_LIST):
+        setattr(status, name, (i - 20) * 0.123)
+    status.vehicleName = 'ussr:R97_Object_140'
+    status.targetVehicleName = 'Object 140'
+    status.targetArmorKind = 'armor_1'
+    return status
+
+
+def main(configFile='config-full.json', number=2000):
+    headless.install(configFile)
+    from dispersionindicator.statsindicator import StatsIndicatorMeta
+    settings = headless.readConfig()
+    status = makeSampleStatus()
+    panels = [ p for p in settings['panelDefs'] if p['channel'] == 'indicator' ]
+    compiled = [ StatsIndicatorMeta(p, status) for p in panels ]
+    legacy = [ LegacyStatsTable(m, p, status) for m, p in zip(compiled, panels) ]
+    statCount = sum(len(p['items']) for p in panels)
+
+    def runLegacy():
+        for panel in legacy:
+            panel.update()
+
+    def runCompiled():
+        for panel in compiled:
+            [ getText() for _, _, getText in panel.statsAccessors ]
+
+    for old, new in zip(legacy, compiled):
+        assert old.update() == [ getText() for _, _, getText in new.statsAccessors ], new.name
+
+    print('config: {}, panels: {}, stats: {}'.format(configFile, len(panels), statCount))
+    results = []
+    for label, func in [ ('before', runLegacy), ('after', runCompiled) ]:
+        best = min(timeit.repeat(func, repeat=5, number=number)) / number
+        results.append(best)
+        print('{:8s} {:8.2f} us/update  {:6.3f} us/stat'.format(label, best * 1e6, best * 1e6 / statCount))
+    print('speedup  {:.2f}x'.format(results[0] / results[1]))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
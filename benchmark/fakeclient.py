@@ -0,0 +1,403 @@
+"""Scriptable stand-ins for the client classes the collector hooks into.
+
+headless.installClient() registers these under the module names of the game
+client, so statscollector imports and installs its hooks on them as it
+would in WoT. Their state is driven from outside (see framegen.py).
+"""
+import math
+from collections import namedtuple
+
+
+class Clock(object):
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class Event(object):
+    def __init__(self):
+        self.__delegates = []
+
+    def __iadd__(self, delegate):
+        if delegate not in self.__delegates:
+            self.__delegates.append(delegate)
+        return self
+
+    def __isub__(self, delegate):
+        if delegate in self.__delegates:
+            self.__delegates.remove(delegate)
+        return self
+
+    def __call__(self, *args, **kwargs):
+        for delegate in self.__delegates[:]:
+            delegate(*args, **kwargs)
+
+    def clear(self):
+        del self.__delegates[:]
+
+
+#
+# Math
+#
+
+class Vector3(object):
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, *args):
+        if len(args) == 1:
+            args = tuple(args[0])
+        self.x, self.y, self.z = args if args else (0.0, 0.0, 0.0)
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __add__(self, other):
+        return Vector3(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other):
+        return Vector3(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __mul__(self, scale):
+        return Vector3(self.x * scale, self.y * scale, self.z * scale)
+
+    def __repr__(self):
+        return 'Vector3({:.3f}, {:.3f}, {:.3f})'.format(self.x, self.y, self.z)
+
+    @property
+    def length(self):
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    @property
+    def yaw(self):
+        return math.atan2(self.x, self.z)
+
+    @property
+    def pitch(self):
+        return -math.atan2(self.y, math.hypot(self.x, self.z))
+
+    def dot(self, other):
+        return self.x * other.x + self.y * other.y + self.z * other.z
+
+    def flatDistTo(self, other):
+        return math.hypot(self.x - other.x, self.z - other.z)
+
+    def normalise(self):
+        length = self.length
+        if length > 0.0:
+            self.x /= length
+            self.y /= length
+            self.z /= length
+
+
+class Matrix(object):
+    """Rotation (yaw about y, pitch about x, roll about z) plus translation."""
+
+    def __init__(self, source=None):
+        if source is None:
+            self.rows = [ [ 1.0, 0.0, 0.0 ], [ 0.0, 1.0, 0.0 ], [ 0.0, 0.0, 1.0 ] ]
+            self.translation = Vector3()
+        else:
+            self.rows = [ list(row) for row in source.rows ]
+            self.translation = Vector3(source.translation)
+
+    def setRotateYPR(self, ypr):
+        yaw, pitch, roll = ypr
+        sy, cy = math.sin(yaw), math.cos(yaw)
+        sp, cp = math.sin(pitch), math.cos(pitch)
+        sr, cr = math.sin(roll), math.cos(roll)
+        self.rows = [
+            [ cy * cr + sy * sp * sr,   -cy * sr + sy * sp * cr,    sy * cp ],
+            [ cp * sr,                  cp * cr,                    -sp     ],
+            [ -sy * cr + cy * sp * sr,  sy * sr + cy * sp * cr,     cy * cp ]
+        ]
+
+    def setTranslate(self, position):
+        self.translation = Vector3(position)
+
+    @property
+    def yaw(self):
+        return math.atan2(self.rows[0][2], self.rows[2][2])
+
+    @property
+    def pitch(self):
+        return -math.asin(max(-1.0, min(1.0, self.rows[1][2])))
+
+    @property
+    def roll(self):
+        return math.atan2(self.rows[1][0], self.rows[1][1])
+
+    def applyVector(self, v):
+        r = self.rows
+        return Vector3(
+            r[0][0] * v.x + r[0][1] * v.y + r[0][2] * v.z,
+            r[1][0] * v.x + r[1][1] * v.y + r[1][2] * v.z,
+            r[2][0] * v.x + r[2][1] * v.y + r[2][2] * v.z
+        )
+
+    def applyPoint(self, v):
+        return self.applyVector(v) + self.translation
+
+    def invert(self):
+        self.rows = [ list(column) for column in zip(*self.rows) ]
+        self.translation = self.applyVector(self.translation) * -1.0
+
+
+#
+# vehicle descriptors
+#
+
+Shell = namedtuple('Shell', 'kind caliber compactDescr')
+Shot = namedtuple('Shot', 'shell piercingPower maxDistance speed gravity')
+Gun = namedtuple('Gun', 'shots shotDispersionAngle shotDispersionFactors pitchLimits')
+VehicleType = namedtuple('VehicleType', 'name shortUserString')
+
+
+class VehicleDescriptor(object):
+    def __init__(self, name, shortUserString, gun):
+        self.type = VehicleType(name, shortUserString)
+        self.gun = gun
+        self.shot = gun.shots[0]
+
+
+def makeVehicleDescriptor(name='ussr:R97_Object_140', shortUserString='Object 140'):
+    shots = (
+        Shot(Shell('ARMOR_PIERCING', 100.0, 1001), (264.0, 215.0), 720.0, 1015.0, 9.81),
+        Shot(Shell('HOLLOW_CHARGE', 100.0, 1002), (330.0, 330.0), 720.0, 895.0, 9.81),
+        Shot(Shell('HIGH_EXPLOSIVE', 100.0, 1003), (50.0, 50.0), 720.0, 895.0, 9.81)
+    )
+    gun = Gun(shots, 0.0033, { 'afterShot': 4.0, 'afterShotInBurst': 1.0 }, { 'absolute': (-0.3, 0.1) })
+    return VehicleDescriptor(name, shortUserString, gun)
+
+
+#
+# entities
+#
+
+class DetailedEngineState(object):
+    def __init__(self):
+        self.rpm = 0.0
+        self.relativeRPM = 0.0
+
+
+class Appearance(object):
+    def __init__(self):
+        self.detailedEngineState = DetailedEngineState()
+
+
+class Vehicle(object):
+    def __init__(self, vehicleID, team, typeDescriptor):
+        self.id = vehicleID
+        self.health = 1000
+        self.publicInfo = { 'team': team }
+        self.typeDescriptor = typeDescriptor
+        self.matrix = Matrix()
+        self.appearance = Appearance()
+        self.gunAnglesPacked = 0
+        self.setPose(Vector3(), 0.0)
+
+    def setPose(self, position, yaw):
+        self.position = Vector3(position)
+        self.yaw = yaw
+        self.matrix.setRotateYPR((yaw, 0.0, 0.0))
+        self.matrix.setTranslate(position)
+
+
+class GunRotator(object):
+    def __init__(self):
+        self.shotPosition = Vector3()
+        self.shotVector = Vector3(0.0, 0.0, 1.0)
+
+    def getCurShotPosition(self):
+        return self.shotPosition, self.shotVector
+
+
+class Camera(object):
+    def __init__(self):
+        self.direction = Vector3(0.0, 0.0, 1.0)
+
+
+class PlayerAvatar(object):
+    def __init__(self, vehicle):
+        self.vehicle = vehicle
+        self.gunRotator = GunRotator()
+        self.dispersionAngle = [ 0.01, 0.0033 ]
+        self.speeds = (0.0, 0.0)
+        self.__aimingInfo = [ 0.0, 1.0, 1.0, 0.0, 0.0, 0.0, 2.3 ]
+        self.__dispersionInfo = [ 1.0, 0.08, 0.15, 0.12, 2.3 ]
+
+    def setAiming(self, startTime, startFactor, multFactor):
+        self.__aimingInfo[0] = startTime
+        self.__aimingInfo[1] = startFactor
+        self.__dispersionInfo[0] = multFactor
+
+    def getOwnVehicleShotDispersionAngle(self, turretRotationSpeed, withShot=0):
+        return self.dispersionAngle
+
+    def __getDetailedVehicleDescriptor(self):
+        return self.vehicle.typeDescriptor
+
+    def __getAdditiveShotDispersionFactor(self, descriptor):
+        return 1.0
+
+    def getVehicleDescriptor(self):
+        return self.vehicle.typeDescriptor
+
+    def getVehicleAttached(self):
+        return self.vehicle
+
+    def getOwnVehicleMatrix(self):
+        return self.vehicle.matrix
+
+    def getOwnVehiclePosition(self):
+        return self.vehicle.position
+
+    def getOwnVehicleSpeeds(self, getInstantaneous=False):
+        return self.speeds
+
+    def shoot(self, isRepeat=False):
+        pass
+
+    def showShotResults(self, results):
+        pass
+
+
+def decodeGunAngles(packed, pitchLimits):
+    return (packed & 0xffff) / 65535.0 * 2.0 * math.pi - math.pi, pitchLimits[0]
+
+
+#
+# collision and penetration (formulas as in gun_marker_ctrl._CrosshairShotResults)
+#
+
+MatInfo = namedtuple('MatInfo', 'kind armor useHitAngle mayRicochet checkCaliberForRichet '
+    'checkCaliberForHitAngleNorm vehicleDamageFactor extra collideOnceOnly')
+CollisionDetails = namedtuple('CollisionDetails', 'dist hitAngleCos matInfo compName')
+ShellExtraData = namedtuple('ShellExtraData', 'normAngle ricochetAngleCos jetLossPPByDist')
+
+IDS_BY_NAMES = { 'armor_1': 1, 'armor_2': 2, 'armor_3': 3, 'armor_screen': 50, 'chassis': 60 }
+
+# (component, local plate normal, distance behind the first hit, material)
+ARMOR_LAYOUT = (
+    ('hull', Vector3(0.0, 0.0, 1.0), 0.0, MatInfo(50, 10.0, True, True, False, True, 0.0, None, True)),
+    ('hull', Vector3(0.0, 0.3, 0.95), 0.6, MatInfo(1, 100.0, True, True, True, True, 1.0, None, False)),
+    ('hull', Vector3(0.0, 0.0, 1.0), 3.0, MatInfo(2, 80.0, True, True, True, True, 1.0, None, False))
+)
+
+
+class CrosshairShotResults(object):
+    _MAX_HIT_ANGLE_BOUND = math.pi / 2.0 - 1e-05
+    _SHELL_EXTRA_DATA = {
+        'ARMOR_PIERCING':       ShellExtraData(math.radians(5.0), math.cos(math.radians(70.0)), 0.0),
+        'ARMOR_PIERCING_CR':    ShellExtraData(math.radians(2.0), math.cos(math.radians(70.0)), 0.0),
+        'HOLLOW_CHARGE':        ShellExtraData(0.0, math.cos(math.radians(80.0)), 0.5),
+        'HIGH_EXPLOSIVE':       ShellExtraData(0.0, 0.0, 0.0)
+    }
+
+    @staticmethod
+    def _computePiercingPowerAtDist(ppDesc, dist, maxDist, piercingMultiplier):
+        pp100, pp500 = ppDesc
+        if dist <= 100.0:
+            return pp100 * piercingMultiplier
+        if dist < maxDist:
+            power = pp100 + (pp500 - pp100) * (dist - 100.0) / 400.0
+            if power > 0.0:
+                return power * piercingMultiplier
+        return 0.0
+
+    @classmethod
+    def _shouldRicochet(cls, shellKind, hitAngleCos, matInfo, caliber):
+        if not matInfo.mayRicochet:
+            return False
+        if hitAngleCos <= cls._SHELL_EXTRA_DATA[shellKind].ricochetAngleCos:
+            if not matInfo.checkCaliberForRichet:
+                return True
+            return matInfo.armor * 3 >= caliber
+        return False
+
+    @classmethod
+    def _computePenetrationArmor(cls, shellKind, hitAngleCos, matInfo, caliber):
+        armor = matInfo.armor
+        if not matInfo.useHitAngle:
+            return armor
+        normalizationAngle = cls._SHELL_EXTRA_DATA[shellKind].normAngle
+        if normalizationAngle > 0.0 and hitAngleCos < 1.0:
+            if matInfo.checkCaliberForHitAngleNorm:
+                if caliber > armor * 2 > 0:
+                    normalizationAngle *= 1.4 * caliber / (armor * 2)
+            hitAngle = math.acos(hitAngleCos) - normalizationAngle
+            if hitAngle < 0.0:
+                hitAngleCos = 1.0
+            else:
+                if hitAngle > cls._MAX_HIT_ANGLE_BOUND:
+                    hitAngle = cls._MAX_HIT_ANGLE_BOUND
+                hitAngleCos = math.cos(hitAngle)
+        if hitAngleCos < 1e-05:
+            hitAngleCos = 1e-05
+        return armor / hitAngleCos
+
+    @classmethod
+    def _getAllCollisionDetails(cls, hitPoint, direction, entity):
+        """Intersects the shot with ARMOR_LAYOUT turned to the entity's yaw."""
+        matrix = Matrix(entity.matrix)
+        matrix.invert()
+        localDirection = matrix.applyVector(direction)
+        localDirection.normalise()
+        details = []
+        for compName, normal, depth, matInfo in ARMOR_LAYOUT:
+            hitAngleCos = abs(localDirection.dot(normal)) / normal.length
+            details.append(CollisionDetails(depth, min(1.0, hitAngleCos), matInfo, compName))
+        return details
+
+
+class GunControlMode(object):
+    def updateGunMarker(self, markerType, gunMarkerInfo, supportMarkersInfo, relaxTime):
+        pass
+
+
+GunMarkerInfo = namedtuple('GunMarkerInfo', 'hitPoint direction size')
+
+
+class CrosshairDataProxy(object):
+    def __setGunMarkerState(self, markerType, gunMarkerState):
+        pass
+
+    def setGunMarkerState(self, markerType, gunMarkerState):
+        self.__setGunMarkerState(markerType, gunMarkerState)
+
+
+class CollisionData(object):
+    def __init__(self, entity):
+        self.entity = entity
+
+
+class DebugController(object):
+    def _update(self):
+        pass
+
+
+class ShotResultIndicatorPlugin(object):
+    def __init__(self, piercingMultiplier=1.0):
+        self.__piercingMultiplier = piercingMultiplier
+
+    def start(self):
+        pass
+
+    def __onVehicleFeedbackReceived(self, eventID, vehicleID, value):
+        pass
+
+
+class ShowShooting(object):
+    def __doShot(self, data):
+        pass
+
+
+class ReplayCtrl(object):
+    isPlaying = False
+    ping = 0
+    fps = 0
+
+
+class LatencyInfo(object):
+    value = (0.0, 0.0, 0.0, 0.045)
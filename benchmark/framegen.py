@@ -0,0 +1,100 @@
+"""Synthetic battle that drives the real collector hooks frame by frame.
+
+The player's vehicle drives a circle while the gun converges after each
+shot and the marker sweeps over an enemy vehicle. Each frame calls the
+hooked client methods in the order the client does: the dispersion angle
+(frame collectors), the gun marker (shot info) and the gun marker state
+(penetration), plus the debug controller (ping) twice a second.
+
+usage:
+    clock = headless.installClient()
+    battle = FrameGenerator(clock)
+    battle.start()
+    for i in range(frames):
+        battle.step(i)
+        battle.runFrame()
+"""
+import sys
+import math
+
+import fakeclient
+from fakeclient import Vector3
+
+
+class FrameGenerator(object):
+    def __init__(self, clock, fps=60.0, turnRadius=40.0, speed=8.0, targetDistance=300.0, shotInterval=6.0):
+        self.clock = clock
+        self.frameTime = 1.0 / fps
+        self.turnRadius = turnRadius
+        self.speed = speed
+        self.targetDistance = targetDistance
+        self.shotFrames = int(shotInterval * fps)
+        self.pingFrames = int(fps / 2)
+        self.vehicle = fakeclient.Vehicle(1, 1, fakeclient.makeVehicleDescriptor())
+        self.target = fakeclient.Vehicle(2, 2, fakeclient.makeVehicleDescriptor('germany:G56_E-100', 'E 100'))
+        self.avatar = fakeclient.PlayerAvatar(self.vehicle)
+        self.camera = fakeclient.Camera()
+        self.gunControlMode = fakeclient.GunControlMode()
+        self.crosshairDataProxy = fakeclient.CrosshairDataProxy()
+        self.debugController = fakeclient.DebugController()
+        self.collData = fakeclient.CollisionData(self.target)
+        self.hitPoint = Vector3()
+        self.direction = Vector3(0.0, 0.0, 1.0)
+        self.frame = 0
+
+    def start(self):
+        """Points BigWorld at this battle, installs every hook and starts the collector."""
+        from dispersionindicator.mod_constants import FRAME_COLLECTORS, HOOK_GROUPS
+        from dispersionindicator.statscollector import g_statsCollector
+        from dispersionindicator.hook import g_hookRegistry
+        g_hookRegistry.install(set(sum(HOOK_GROUPS.values(), [])))
+        bigWorld = sys.modules['BigWorld']
+        bigWorld.player = lambda: self.avatar
+        bigWorld.camera = lambda: self.camera
+        self.step(0)
+        g_statsCollector.start()
+        stats = g_statsCollector.clientStatus
+        stats.arenaName = 'synthetic'
+        stats.vehicleName = self.vehicle.typeDescriptor.type.name
+        stats.playerTeam = self.vehicle.publicInfo['team']
+        g_statsCollector.setFrameCollectors(FRAME_COLLECTORS)
+        g_statsCollector.updatePiercingMultiplier(1.0)
+        return g_statsCollector
+
+    def step(self, frame):
+        """Moves the scripted state to the given frame."""
+        self.frame = frame
+        now = 1000.0 + frame * self.frameTime
+        self.clock.now = now
+        angle = frame * self.frameTime * self.speed / self.turnRadius
+        position = Vector3(self.turnRadius * math.sin(angle), 0.0, self.turnRadius * math.cos(angle))
+        yaw = angle + math.pi / 2.0
+        self.vehicle.setPose(position, yaw)
+        self.vehicle.gunAnglesPacked = frame & 0xffff
+        engineState = self.vehicle.appearance.detailedEngineState
+        engineState.rpm = 1800.0 + 200.0 * math.sin(angle * 3.0)
+        engineState.relativeRPM = engineState.rpm / 2800.0
+        self.avatar.speeds = (self.speed, self.speed / self.turnRadius)
+        shotFrame = frame - frame % self.shotFrames
+        self.avatar.setAiming(1000.0 + shotFrame * self.frameTime, 4.0, 1.2)
+        self.avatar.dispersionAngle = [ 0.0033 * (1.2 + 3.0 * math.exp(-(frame - shotFrame) * self.frameTime)), 0.0033 ]
+        # the marker sweeps a couple of meters across the target's front plate
+        sweep = math.sin(frame * self.frameTime * 0.7) * 1.5
+        targetPosition = Vector3(0.0, 0.0, self.targetDistance)
+        self.target.setPose(targetPosition, math.pi + 0.4 * math.sin(frame * self.frameTime * 0.05))
+        self.hitPoint = Vector3(sweep, 1.2, self.targetDistance - 3.0)
+        self.direction = self.hitPoint - position
+        self.direction.normalise()
+        self.camera.direction = Vector3(self.direction)
+        self.avatar.gunRotator.shotPosition = position + Vector3(0.0, 2.0, 0.0)
+        self.avatar.gunRotator.shotVector = self.direction * 1015.0
+
+    def runFrame(self):
+        """Calls the hooked client methods of one frame."""
+        avatar = self.avatar
+        avatar.getOwnVehicleShotDispersionAngle(0.0)
+        gunMarkerInfo = fakeclient.GunMarkerInfo(self.hitPoint, self.direction, 0.0)
+        self.gunControlMode.updateGunMarker(0, gunMarkerInfo, None, 0.0)
+        self.crosshairDataProxy.setGunMarkerState(0, (self.hitPoint, self.direction, self.collData))
+        if self.frame % self.pingFrames == 0:
+            self.debugController._update()
@@ -0,0 +1,140 @@
+"""Stand-ins for the game client modules needed to import the mod outside WoT.
+
+install() provides only the names the mod touches at import time, enough for
+the config and the indicators. installClient() adds the scriptable client
+classes of fakeclient.py so statscollector and its hooks can run. Call one of
+them before importing anything from the dispersionindicator package.
+"""
+import os
+import sys
+import time
+import types
+import logging
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PYTHON_DIR = os.path.join(ROOT_DIR, 'python')
+CONFIG_DIR = os.path.join(ROOT_DIR, 'configs')
+
+
+class _Anything(object):
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __call__(self, *args, **kwargs):
+        return None
+
+    def __getattr__(self, name):
+        return _Anything()
+
+
+class _Enum(object):
+    def __init__(self, *names):
+        for i, name in enumerate(names):
+            setattr(self, name, i)
+
+
+def _module(name, **attrs):
+    module = sys.modules.get(name)
+    if module is None:
+        module = types.ModuleType(name)
+        sys.modules[name] = module
+        parent, _, child = name.rpartition('.')
+        if parent:
+            setattr(_module(parent), child, module)
+    for key, value in attrs.items():
+        setattr(module, key, value)
+    return module
+
+
+class _ResMgr(object):
+    """Serves CONFIG_FILES from the repository configs directory."""
+    def __init__(self, configFile='config-full.json'):
+        self.files = {
+            'default.json': os.path.join(CONFIG_DIR, 'default.json'),
+            'config.json':  os.path.join(CONFIG_DIR, configFile)
+        }
+
+    def __path(self, name):
+        return self.files.get(os.path.basename(name), None)
+
+    def isFile(self, name):
+        return self.__path(name) is not None
+
+    def openSection(self, name):
+        with open(self.__path(name), 'rb') as fp:
+            return _DataSection(fp.read())
+
+
+class _DataSection(object):
+    def __init__(self, data):
+        self.asString = data
+
+
+class _DependencyManager(object):
+    def instance(self, cls):
+        return _Anything()
+
+
+def install(configFile='config-full.json'):
+    logging.basicConfig(level=logging.WARNING)
+    if PYTHON_DIR not in sys.path:
+        sys.path.insert(0, PYTHON_DIR)
+    resMgr = _ResMgr(configFile)
+    _module('ResMgr', isFile=resMgr.isFile, openSection=resMgr.openSection)
+    _module('BigWorld', time=time.time)
+    _module('GUI', screenResolution=lambda: (1920, 1080))
+    _module('debug_utils', LOG_CURRENT_EXCEPTION=lambda: logging.exception('exception'))
+    _module('constants', ARENA_PERIOD=_Enum('IDLE', 'WAITING', 'PREBATTLE', 'BATTLE', 'AFTERBATTLE'))
+    _module('helpers', dependency=_DependencyManager())
+    _module('skeletons.gui.app_loader',
+        IAppLoader=object,
+        GuiGlobalSpaceID=_Enum('UNDEFINED', 'WAITING', 'LOGIN', 'LOBBY', 'BATTLE_LOADING', 'BATTLE'))
+    _module('gui.battle_control.battle_constants',
+        CROSSHAIR_VIEW_ID=_Enum('UNDEFINED', 'ARCADE', 'SNIPER', 'STRATEGIC', 'POSTMORTEM'))
+    _module('gui.Scaleform.framework', ViewSettings=_Anything, ScopeTemplates=_Anything())
+    _module('gui.Scaleform.framework.managers.loaders', SFViewLoadParams=_Anything)
+    _module('gui.Scaleform.framework.entities.View', View=object, ViewKey=_Anything)
+    _module('frameworks.wulf', WindowLayer=_Anything())
+
+
+def installClient(configFile='config-full.json'):
+    """Returns the Clock that drives BigWorld.time()."""
+    import fakeclient
+    install(configFile)
+    clock = fakeclient.Clock()
+    _module('BigWorld',
+        time=clock,
+        player=lambda: None,
+        camera=fakeclient.Camera,
+        statPing=lambda: 42.0,
+        getFPS=lambda: (60.0, 60.0, 60.0),
+        LatencyInfo=fakeclient.LatencyInfo,
+        callback=lambda delay, func: None,
+        cancelCallback=lambda callbackID: None)
+    _module('Math', Vector3=fakeclient.Vector3, Matrix=fakeclient.Matrix)
+    _module('BattleReplay', g_replayCtrl=fakeclient.ReplayCtrl())
+    _module('Event', Event=fakeclient.Event)
+    _module('Avatar', PlayerAvatar=fakeclient.PlayerAvatar)
+    _module('AvatarInputHandler.control_modes', _GunControlMode=fakeclient.GunControlMode)
+    _module('AvatarInputHandler.gun_marker_ctrl', _CrosshairShotResults=fakeclient.CrosshairShotResults)
+    _module('gun_rotation_shared', decodeGunAngles=fakeclient.decodeGunAngles)
+    _module('vehicle_extras', ShowShooting=fakeclient.ShowShooting)
+    _module('gui.battle_control.avatar_getter', getArena=_Anything, getVehicleTypeDescriptor=_Anything)
+    _module('gui.battle_control.controllers.crosshair_proxy', CrosshairDataProxy=fakeclient.CrosshairDataProxy)
+    _module('gui.battle_control.controllers.debug_ctrl', DebugController=fakeclient.DebugController)
+    _module('gui.Scaleform.daapi.view.battle.shared.crosshair.plugins',
+        ShotResultIndicatorPlugin=fakeclient.ShotResultIndicatorPlugin)
+    _module('material_kinds',
+        IDS_BY_NAMES=fakeclient.IDS_BY_NAMES,
+        EFFECT_MATERIAL_INDEXES_BY_IDS={},
+        EFFECT_MATERIAL_NAMES_BY_INDEXES={})
+    _module('skeletons.gui.battle_session', IBattleSessionProvider=object)
+    return clock
+
+
+def readConfig():
+    """Returns the settings built by the real _readConfig."""
+    import mod_dispersionindicator
+    from dispersionindicator.mod_constants import MOD
+    mod_dispersionindicator._logger = logging.getLogger(MOD.NAME)
+    return mod_dispersionindicator._readConfig()
@@ -0,0 +1,163 @@
+"""Self-describing columnar binary log.
+
+layout (little endian):
+    segment := MAGIC, uint32 header length, header (JSON), block*
+    block   := BLOCK_MARK, uint32 row count, column*
+    column  := type code ('d' or 's'), null mask (1 bit per row, 1 = None), data
+    data    := 'd': float64 * rows
+               's': uint32 length * rows, utf-8 bytes
+
+A file opened in append mode holds several segments back to back.
+Only the standard library is used so the reader runs outside the game.
+"""
+import sys
+import json
+import struct
+from array import array
+
+MAGIC = b'DILOG\x00\x01\x00'
+BLOCK_MARK = b'B'
+FILE_EXTENSION = '.dilog'
+
+_UINT32 = struct.Struct('<I')
+_BIG_ENDIAN = sys.byteorder == 'big'
+_NUMBER_TYPES = (int, float, bool) + ((long, ) if sys.version_info[0] == 2 else ())
+_TEXT_TYPE = unicode if sys.version_info[0] == 2 else str
+
+
+def _toBytes(values):
+    if _BIG_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes() if hasattr(values, 'tobytes') else values.tostring()
+
+
+def _fromBytes(typecode, data):
+    values = array(typecode)
+    if hasattr(values, 'frombytes'):
+        values.frombytes(data)
+    else:
+        values.fromstring(data)
+    if _BIG_ENDIAN:
+        values.byteswap()
+    return values
+
+
+def _encodeText(value):
+    if isinstance(value, bytes):
+        return value
+    if not isinstance(value, _TEXT_TYPE):
+        value = _TEXT_TYPE(value)
+    return value.encode('utf-8')
+
+
+def _decodeText(data):
+    # native str: bytes on python 2, unicode on python 3
+    return data if str is bytes else data.decode('utf-8')
+
+
+def _packMask(mask):
+    packed = bytearray((len(mask) + 7) // 8)
+    for i, isNull in enumerate(mask):
+        if isNull:
+            packed[i >> 3] |= 1 << (i & 7)
+    return bytes(packed)
+
+
+def _unpackMask(packed, count):
+    packed = bytearray(packed)
+    return [ bool(packed[i >> 3] & (1 << (i & 7))) for i in range(count) ]
+
+
+def encodeBlock(rows, columnCount):
+    chunks = [ BLOCK_MARK, _UINT32.pack(len(rows)) ]
+    for i in range(columnCount):
+        values = [ row[i] for row in rows ]
+        mask = _packMask([ value is None for value in values ])
+        if all(isinstance(value, _NUMBER_TYPES) for value in values if value is not None):
+            data = array('d', [ 0.0 if value is None else float(value) for value in values ])
+            chunks.extend([ b'd', mask, _toBytes(data) ])
+        else:
+            texts = [ b'' if value is None else _encodeText(value) for value in values ]
+            lengths = struct.pack('<{}I'.format(len(texts)), *[ len(text) for text in texts ])
+            chunks.extend([ b's', mask, lengths, b''.join(texts) ])
+    return b''.join(chunks)
+
+
+class BinaryFormat(object):
+    extension = FILE_EXTENSION
+
+    def __init__(self, fp):
+        self.__fp = fp
+        self.__columnCount = 0
+
+    def writeHeader(self, header):
+        data = json.dumps({
+            'vehicleName':  header.get('vehicleName', None),
+            'arenaName':    header.get('arenaName', None),
+            'comment':      header.get('comment', None),
+            'names':        list(header['names']),
+            'units':        list(header['units'])
+        }).encode('utf-8')
+        self.__columnCount = len(header['names'])
+        self.__fp.write(MAGIC + _UINT32.pack(len(data)) + data)
+
+    def writeRows(self, rows):
+        if rows:
+            self.__fp.write(encodeBlock(rows, self.__columnCount))
+
+    def close(self):
+        pass
+
+
+def _readExactly(fp, size):
+    data = fp.read(size)
+    if len(data) != size:
+        raise EOFError('truncated binary log')
+    return data
+
+
+def iterBlocks(fp):
+    """Yields (header, columns) for each block, columns being lists with None for nulls.
+
+    A block cut short by an interrupted write ends the iteration.
+    """
+    header = None
+    while True:
+        mark = fp.read(1)
+        if not mark:
+            return
+        try:
+            if mark == MAGIC[:1]:
+                _readExactly(fp, len(MAGIC) - 1)
+                size = _UINT32.unpack(_readExactly(fp, 4))[0]
+                header = json.loads(_readExactly(fp, size).decode('utf-8'))
+                continue
+            if mark != BLOCK_MARK or header is None:
+                raise ValueError('broken binary log')
+            count = _UINT32.unpack(_readExactly(fp, 4))[0]
+            columns = []
+            for _ in header['names']:
+                typecode = _readExactly(fp, 1)
+                mask = _unpackMask(_readExactly(fp, (count + 7) // 8), count)
+                if typecode == b'd':
+                    values = _fromBytes('d', _readExactly(fp, count * 8)).tolist()
+                else:
+                    lengths = struct.unpack('<{}I'.format(count), _readExactly(fp, count * 4))
+                    data = _readExactly(fp, sum(lengths))
+                    values = []
+                    offset = 0
+                    for length in lengths:
+                        values.append(_decodeText(data[offset:offset + length]))
+                        offset += length
+                columns.append([ None if isNull else value for value, isNull in zip(values, mask) ])
+        except EOFError:
+            return
+        yield header, columns
+
+
+def iterRows(fp):
+    """Yields (header, row) for every row."""
+    for header, columns in iterBlocks(fp):
+        for row in zip(*columns):
+            yield header, list(row)
@@ -0,0 +1,113 @@
+import math
+
+
+class CircleFit(object):
+    """Least-squares circle fit (Kasa) over the last `size` points on the x-z plane.
+
+    Moment sums are kept relative to an origin near the points and updated
+    in O(1) per push. Once per lap the origin moves to the newest point and
+    the sums are rebuilt, which keeps the terms small and drops rounding error.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.clear()
+
+    def clear(self):
+        self.__points = [ None ] * self.size
+        self.__index = 0
+        self.__origin = None
+        self.__sums = [ 0.0 ] * 10
+        self.count = 0
+        self.radius = None
+        self.curvature = None
+        self.residual = None
+
+    def __terms(self, point):
+        x = point[0] - self.__origin[0]
+        z = point[1] - self.__origin[1]
+        xx = x * x
+        zz = z * z
+        w = xx + zz
+        return (x, z, xx, zz, x * z, xx * x, x * zz, xx * z, zz * z, w * w)
+
+    def __rebase(self, origin):
+        self.__origin = origin
+        sums = [ 0.0 ] * 10
+        for point in self.__points:
+            if point is None:
+                continue
+            for i, term in enumerate(self.__terms(point)):
+                sums[i] += term
+        self.__sums = sums
+
+    def push(self, x, z):
+        point = (x, z)
+        if self.__origin is None:
+            self.__origin = point
+        sums = self.__sums
+        index = self.__index
+        old = self.__points[index]
+        if old is not None:
+            for i, term in enumerate(self.__terms(old)):
+                sums[i] -= term
+        else:
+            self.count += 1
+        for i, term in enumerate(self.__terms(point)):
+            sums[i] += term
+        self.__points[index] = point
+        index += 1
+        if index == self.size:
+            index = 0
+            self.__rebase(point)
+        self.__index = index
+        self.__solve()
+
+    def __solve(self):
+        n = self.count
+        self.radius = self.curvature = self.residual = None
+        if n < 3:
+            return
+        Sx, Sz, Sxx, Szz, Sxz, Sxxx, Sxzz, Sxxz, Szzz, Sww = self.__sums
+        mx = Sx / n
+        mz = Sz / n
+        Cuu = Sxx / n - mx * mx
+        Cvv = Szz / n - mz * mz
+        Cuv = Sxz / n - mx * mz
+        Cuuu = Sxxx / n - 3.0 * mx * Sxx / n + 2.0 * mx ** 3
+        Cvvv = Szzz / n - 3.0 * mz * Szz / n + 2.0 * mz ** 3
+        Cuvv = Sxzz / n - mx * Szz / n - 2.0 * mz * Sxz / n + 2.0 * mx * mz * mz
+        Cuuv = Sxxz / n - mz * Sxx / n - 2.0 * mx * Sxz / n + 2.0 * mx * mx * mz
+        spread = Cuu + Cvv
+        det = Cuu * Cvv - Cuv * Cuv
+        # stationary or moving on a straight line: no finite radius
+        if spread <= 1e-8 or det <= 1e-9 * spread * spread:
+            self.curvature = 0.0
+            return
+        bu = 0.5 * (Cuuu + Cuvv)
+        bv = 0.5 * (Cvvv + Cuuv)
+        a = (bu * Cvv - bv * Cuv) / det
+        b = (bv * Cuu - bu * Cuv) / det
+        radius = math.sqrt(a * a + b * b + spread)
+        cx = mx + a
+        cz = mz + b
+
+        D = -2.0 * cx
+        E = -2.0 * cz
+        F = cx * cx + cz * cz - radius * radius
+        error = (Sww + D * D * Sxx + E * E * Szz + n * F * F
+            + 2.0 * D * (Sxxx + Sxzz) + 2.0 * E * (Sxxz + Szzz) + 2.0 * F * (Sxx + Szz)
+            + 2.0 * D * E * Sxz + 2.0 * D * F * Sx + 2.0 * E * F * Sz)
+        # algebraic error (d^2 - r^2) is about 2r(d - r) near the circle
+        self.residual = math.sqrt(max(error, 0.0) / n) / (2.0 * radius)
+        self.radius = radius
+
+        # positive when turning counterclockwise seen from above
+        newest = self.__points[self.__index - 1]
+        oldest = self.__points[self.__index] if self.count == self.size else self.__points[0]
+        px = newest[0] - self.__origin[0]
+        pz = newest[1] - self.__origin[1]
+        dx = newest[0] - oldest[0]
+        dz = newest[1] - oldest[1]
+        cross = dx * (cz - pz) - dz * (cx - px)
+        self.curvature = 1.0 / radius if cross >= 0 else -1.0 / radius
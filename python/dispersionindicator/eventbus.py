@@ -0,0 +1,83 @@
+import logging
+
+import BigWorld
+from debug_utils import LOG_CURRENT_EXCEPTION
+
+from mod_constants import MOD
+
+_logger = logging.getLogger(MOD.NAME)
+
+
+class EventBus(object):
+    """Defers collector events to the next tick and dispatches them in one go.
+
+    Subscribers are indexed by event name. Coalescing subscribers (panels) are
+    called at most once per dispatch however many of their events were raised
+    in between; the others (loggers) receive every event in the raised order.
+    Handlers are called as handler(eventName, eventTime).
+    """
+
+    def __init__(self):
+        self.__callbackID = None
+        self.clear()
+
+    def clear(self):
+        self.__cancel()
+        self.__coalesced = {}
+        self.__every = {}
+        self.__pendingNames = set()
+        self.__pendingEvents = []
+        self.raised = 0
+        self.coalesced = 0
+        self.dispatched = 0
+
+    def subscribe(self, eventNames, handler, coalesce=True):
+        index = self.__coalesced if coalesce else self.__every
+        for eventName in eventNames:
+            index.setdefault(eventName, []).append(handler)
+
+    def raiseEvent(self, eventName, eventTime):
+        self.raised += 1
+        pending = False
+        if eventName in self.__coalesced:
+            if eventName in self.__pendingNames:
+                self.coalesced += 1
+            self.__pendingNames.add(eventName)
+            pending = True
+        if eventName in self.__every:
+            self.__pendingEvents.append((eventName, eventTime))
+            pending = True
+        if pending and self.__callbackID is None:
+            self.__callbackID = BigWorld.callback(0, self.__dispatch)
+
+    def logCounters(self):
+        _logger.info('EventBus: raised=%d, coalesced=%d, dispatched=%d', self.raised, self.coalesced, self.dispatched)
+
+    def __cancel(self):
+        if self.__callbackID is not None:
+            BigWorld.cancelCallback(self.__callbackID)
+            self.__callbackID = None
+
+    def __dispatch(self):
+        self.__callbackID = None
+        names, self.__pendingNames = self.__pendingNames, set()
+        events, self.__pendingEvents = self.__pendingEvents, []
+        self.dispatched += 1
+        for eventName, eventTime in events:
+            for handler in self.__every[eventName]:
+                self.__call(handler, eventName, eventTime)
+        if not names:
+            return
+        eventTime = BigWorld.time()
+        called = set()
+        for eventName in names:
+            for handler in self.__coalesced[eventName]:
+                if handler not in called:
+                    called.add(handler)
+                    self.__call(handler, eventName, eventTime)
+
+    def __call(self, handler, eventName, eventTime):
+        try:
+            handler(eventName, eventTime)
+        except:
+            LOG_CURRENT_EXCEPTION()
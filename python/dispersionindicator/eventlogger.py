@@ -7,6 +7,10 @@ import BigWorld
 from gui.battle_control import avatar_getter
 
 from statsindicator import StatsIndicatorMeta
+from logwriter import AsyncLogWriter, CsvFormat
+from logindex import LogRecorder
+from logrotate import LogRotator
+from statscollector import g_statsCollector
 from mod_constants import MOD, LOG_DIR, EVENT
 
 _logger = logging.getLogger(MOD.NAME)
@@ -15,40 +19,57 @@ class EventLogger(StatsIndicatorMeta):
     def __init__(self, config, clientStatus):
         super(EventLogger, self).__init__(config, clientStatus)
         self.log_file = os.path.join(LOG_DIR, config['logfile'])
+        self.rotator = LogRotator.fromConfig(self.log_file, config)
         self.names = config['items']
         self.header = ['#'] + self.names
         self.unit = ['#'] + list(map(lambda x: self.getUnit(x, ''), self.names))
         self.vehicleName = avatar_getter.getVehicleTypeDescriptor().type.name
         self.acceptEvents = config['events']
-        self.__file = None
+        self.exprItems = set(key for key in self.names if 'expr' in config['statsDefs'].get(key, {}))
+        self.__expressions = [ g_statsCollector.getExpression(config['statsDefs'][key]['expr']) for key in self.exprItems ]
+        self.chunkSize = config.get('chunkSize', 64)
+        self.flushInterval = config.get('flushInterval', 1.0)
+        self.__writer = None
+        self.__recorder = None
 
     def start(self):
         super(EventLogger, self).start()
-        self.__strage = []
-        if not os.path.isdir(LOG_DIR):
-            _logger.info('%s.outputLog: make dir %s', self.className, LOG_DIR)
-            os.makedirs(LOG_DIR)
-        self.__file = open(self.log_file, 'ab', 0)
-        self.__writer = csv.writer(self.__file, dialect='excel')
-        self.__writer.writerow(['# vehicle={}'.format(self.vehicleName)])
-        self.__writer.writerow(self.header)
-        self.__writer.writerow(self.unit)
+        header = {
+            'comment':      '# vehicle={}'.format(self.vehicleName),
+            'vehicleName':  self.vehicleName,
+            'names':        self.names,
+            'units':        self.unit[1:]
+        }
+        self.__recorder = LogRecorder('event', self.log_file, 'csv', self.names, True)
+        self.__writer = AsyncLogWriter(self.log_file, 'ab', CsvFormat, header,
+            chunkSize=self.chunkSize, flushInterval=self.flushInterval)
+        self.__writer.start()
 
     def stop(self):
         super(EventLogger, self).stop()
-        self.__file.close()
-        self.__file = None
+        if self.__writer is not None:
+            self.__writer.stop()
+            arenaName = getattr(self.vehicleStats, 'arenaName', None)
+            self.__recorder.commit(self.vehicleName, arenaName, self.__writer.writtenRows)
+            self.__writer = None
+            if self.rotator is not None:
+                self.rotator.onBattleEnd()
 
-    def onEvent(self, reason):
-        if self.__file is None:
-            return
-        if reason['eventName'] not in self.acceptEvents:
+    def onEvent(self, eventName, eventTime):
+        if self.__writer is None:
             return
+        # the collector evaluates an expression only on the events of its
+        # statuses, so bring it up to date for this row
+        for expression in self.__expressions:
+            expression.evaluate(self.vehicleStats)
         def getStatus(key):
-            if key in ['eventName', 'eventTime']:
-                return reason[key]           
+            if key == 'eventName':
+                return eventName
+            if key == 'eventTime':
+                return eventTime
+            if key in self.exprItems:
+                return self.getStatus(key)
             return getattr(self.vehicleStats, key, '')
         data = [ getStatus(key) for key in self.names ]
-        data.insert(0, '')
-        self.__strage.append(data)
-        self.__writer.writerow(data)
+        self.__recorder.addRow(eventTime)
+        self.__writer.write(data)
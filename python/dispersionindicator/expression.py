@@ -0,0 +1,136 @@
+import __future__
+import ast
+import math
+
+from mod_constants import CLIENT_STATUS_LIST, CONSTANT
+
+FUNCTIONS = {
+    'abs':      abs,
+    'min':      min,
+    'max':      max,
+    'sqrt':     math.sqrt,
+    'log':      math.log,
+    'log10':    math.log10,
+    'exp':      math.exp,
+    'sin':      math.sin,
+    'cos':      math.cos,
+    'tan':      math.tan,
+    'asin':     math.asin,
+    'acos':     math.acos,
+    'atan':     math.atan,
+    'atan2':    math.atan2,
+    'hypot':    math.hypot,
+    'degrees':  math.degrees,
+    'radians':  math.radians,
+    'floor':    math.floor,
+    'ceil':     math.ceil
+}
+
+CONSTANTS = dict(CONSTANT, pi=math.pi, e=math.e)
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp, ast.Call, ast.Name, ast.Num, ast.Load,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.USub, ast.UAdd, ast.Not,
+    ast.And, ast.Or, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE
+)
+
+_MAX_EXPONENT = 64
+
+_STATUS_ARG = '_s'
+
+_STATUS_NAMES = frozenset(CLIENT_STATUS_LIST)
+
+_compiled = {}
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+def parseExpression(source):
+    """Returns (tree, status names) of an expression, raising ExpressionError
+    for anything but arithmetic, comparisons and calls of FUNCTIONS on statuses,
+    CONSTANTS and numbers."""
+    if not isinstance(source, basestring):
+        raise ExpressionError('not a string: {!r}'.format(source))
+    try:
+        tree = ast.parse(source.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ExpressionError('syntax error: {}'.format(e.msg))
+    names = set()
+    callees = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ExpressionError('not allowed: {}'.format(node.__class__.__name__))
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name):
+                raise ExpressionError('not allowed: call of {}'.format(node.func.__class__.__name__))
+            if node.func.id not in FUNCTIONS:
+                raise ExpressionError('unknown function: {}'.format(node.func.id))
+            if node.keywords or node.starargs or node.kwargs:
+                raise ExpressionError('only positional arguments: {}'.format(node.func.id))
+            # ast.walk is breadth first, so the callee is seen after its Call
+            callees.add(node.func)
+        elif isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+            # compile() folds constant powers, so a large or nested exponent
+            # like (9 ** 64) ** 64 would freeze the client on battle entry
+            if not isinstance(node.right, ast.Num) or abs(node.right.n) > _MAX_EXPONENT:
+                raise ExpressionError('exponent must be a number up to {}'.format(_MAX_EXPONENT))
+            if any(isinstance(child, ast.BinOp) and isinstance(child.op, ast.Pow) for child in ast.walk(node.left)):
+                raise ExpressionError('not allowed: nested power')
+        elif isinstance(node, ast.Name):
+            if node.id in _STATUS_NAMES:
+                names.add(node.id)
+            elif node.id in FUNCTIONS:
+                if node not in callees:
+                    raise ExpressionError('function without call: {}'.format(node.id))
+            elif node.id not in CONSTANTS:
+                raise ExpressionError('unknown name: {}'.format(node.id))
+    return tree, names
+
+
+class _StatusLoader(ast.NodeTransformer):
+    def visit_Name(self, node):
+        if node.id not in _STATUS_NAMES:
+            return node
+        value = ast.Name(id=_STATUS_ARG, ctx=ast.Load())
+        return ast.copy_location(ast.Attribute(value=value, attr=node.id, ctx=ast.Load()), node)
+
+
+def compileExpression(source):
+    """Returns (key, function, status names); function(clientStatus) evaluates the expression.
+
+    The key is the same for expressions that differ only in spacing. Compiled
+    once per source for the session.
+    """
+    result = _compiled.get(source, None)
+    if result is not None:
+        return result
+    tree, names = parseExpression(source)
+    key = ast.dump(tree)
+    body = _StatusLoader().visit(tree).body
+    args = ast.arguments(args=[ ast.Name(id=_STATUS_ARG, ctx=ast.Param()) ], vararg=None, kwarg=None, defaults=[])
+    lambdaTree = ast.fix_missing_locations(ast.Expression(body=ast.Lambda(args=args, body=body)))
+    namespace = { '__builtins__': {} }
+    namespace.update(FUNCTIONS)
+    namespace.update(CONSTANTS)
+    code = compile(lambdaTree, '<expr: {}>'.format(source), 'eval', __future__.division.compiler_flag, True)
+    function = eval(code, namespace)
+    result = _compiled[source] = (key, function, names)
+    return result
+
+
+class Expression(object):
+    """Latest value of a compiled expression, shared by every panel and logger using it."""
+    __slots__ = ('source', 'function', 'value')
+
+    def __init__(self, source, function):
+        self.source = source
+        self.function = function
+        self.value = None
+
+    def evaluate(self, clientStatus):
+        try:
+            self.value = self.function(clientStatus)
+        except (AttributeError, TypeError, ValueError, ZeroDivisionError, OverflowError):
+            self.value = None
@@ -0,0 +1,91 @@
+import logging
+
+from statsindicator import StatsIndicator
+from statscollector import g_statsCollector
+from mod_constants import MOD, CONSTANT
+
+_logger = logging.getLogger(MOD.NAME)
+
+
+class GraphIndicator(StatsIndicator):
+    """StatsIndicator that also plots its items over the last `duration` seconds.
+
+    The samples come from the history of the collector and are reduced to at
+    most `points` per item before they are converted to pixels and sent, so
+    the Flash side draws a constant number of segments however many samples
+    the window holds. An item is sent again only when its history has a new
+    sample.
+    """
+
+    def __init__(self, config, clientStatus):
+        super(GraphIndicator, self).__init__(config, clientStatus)
+        graph = config['graph']
+        self.width = graph['width']
+        self.height = graph['height']
+        self.duration = graph['duration']
+        self.points = graph['points']
+        self.method = graph['downsample']
+        self.__series = []
+        for series in graph['series']:
+            statDef = config['statsDefs'].get(series['name'], {})
+            factor = statDef.get('factor', None)
+            if isinstance(factor, basestring):
+                factor = CONSTANT.get(factor, None)
+            self.__series.append((series['name'], statDef.get('status', series['name']), factor or 1.0, series.get('range', None)))
+        self.__lastTimes = {}
+        self.graphSentCount = 0
+        self.graphSuppressedCount = 0
+
+    def onCreated(self, pyEntity):
+        self.__lastTimes = {}
+        super(GraphIndicator, self).onCreated(pyEntity)
+
+    def start(self):
+        super(GraphIndicator, self).start()
+        self.__lastTimes = {}
+
+    def stop(self):
+        super(GraphIndicator, self).stop()
+        _logger.info('%s.stop: "%s" graph sent=%d, suppressed=%d', self.className, self.name, self.graphSentCount, self.graphSuppressedCount)
+
+    def update(self):
+        super(GraphIndicator, self).update()
+        if self.panelState != 'START':
+            return
+        history = g_statsCollector.history
+        lastTimes = self.__lastTimes
+        for name, statusName, factor, valueRange in self.__series:
+            series = history.get(statusName)
+            if series is None or not series.count:
+                continue
+            lastTime = series.lastTime
+            if lastTimes.get(name, None) == lastTime:
+                self.graphSuppressedCount += 1
+                continue
+            lastTimes[name] = lastTime
+            times, values = series.downsample(statusName, self.points, since=lastTime - self.duration, method=self.method)
+            self.graphSentCount += 1
+            self.setGraph(name, self.__toPixels(times, values, lastTime, factor, valueRange))
+
+    def __toPixels(self, times, values, lastTime, factor, valueRange):
+        if not values:
+            return []
+        if valueRange is not None:
+            low, high = valueRange
+        else:
+            low = min(values) * factor
+            high = max(values) * factor
+            if low > high:
+                low, high = high, low
+        if high <= low:
+            high = low + 1.0
+        width = self.width
+        height = self.height
+        scaleX = width / self.duration
+        scaleY = height / (high - low)
+        points = []
+        for time, value in zip(times, values):
+            y = height - (value * factor - low) * scaleY
+            points.append(int(round(width - (lastTime - time) * scaleX)))
+            points.append(int(round(min(max(y, 0.0), height))))
+        return points
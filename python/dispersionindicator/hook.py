@@ -1,22 +1,109 @@
+import logging
 
+from mod_constants import MOD
+
+_logger = logging.getLogger(MOD.NAME)
+
+
+_MISSING = object()
 
-def overrideMethod(cls, method):
-    def decorator(handler):
-        orig = getattr(cls, method)
-        newm = lambda *args, **kwargs: handler(orig, *args, **kwargs)
-        if type(orig) is not property:
-            setattr(cls, method, newm)
-        else:
-            setattr(cls, method, property(newm))
-    return decorator
 
+class _Hook(object):
+    def __init__(self, cls, method, handler, groups, always):
+        self.cls = cls
+        self.method = method
+        self.handler = handler
+        self.groups = frozenset(groups)
+        self.always = always
+        self.active = False
+        self.installed = None
+        self.raw = _MISSING
 
-def overrideClassMethod(cls, method):
-    def decorator(handler):
-        orig = getattr(cls, method)
-        newm = classmethod(lambda *args, **kwargs: handler(orig, *args, **kwargs))
+    @property
+    def name(self):
+        return '{}.{}'.format(self.cls.__name__, self.method)
+
+    def install(self):
+        if self.installed is not None:
+            # still chained under another mod's override, just switch it back on
+            self.active = True
+            return
+        self.raw = self.cls.__dict__.get(self.method, _MISSING)
+        orig = getattr(self.cls, self.method)
+        handler = self.handler
+        hook = self
+        def newm(*args, **kwargs):
+            if hook.active:
+                return handler(orig, *args, **kwargs)
+            return orig(*args, **kwargs)
         if type(orig) is not property:
-            setattr(cls, method, newm)
+            self.installed = newm
+        else:
+            self.installed = property(newm)
+        setattr(self.cls, self.method, self.installed)
+        self.active = True
+
+    def uninstall(self):
+        if self.installed is None:
+            return True
+        self.active = False
+        if self.cls.__dict__.get(self.method, _MISSING) is not self.installed:
+            return False
+        if self.raw is _MISSING:
+            delattr(self.cls, self.method)
         else:
-            setattr(cls, method, property(newm))
-    return decorator
+            setattr(self.cls, self.method, self.raw)
+        self.installed = None
+        self.raw = _MISSING
+        return True
+
+
+class HookRegistry(object):
+    """Overrides that are installed on demand and can be removed again.
+
+    Each hook belongs to groups; install(groups) installs the hooks sharing
+    at least one of them and uninstalls the others. Uninstalling restores
+    the original class attribute. When another mod has overridden the same
+    method on top of ours, the original cannot be put back without dropping
+    that mod's override, so the hook stays in the chain but only passes the
+    call through.
+
+    A hook registered with always=True is installed right away and never
+    removed, for client state that may be reported before initPanel.
+    """
+
+    def __init__(self):
+        self.__hooks = []
+
+    def overrideMethod(self, cls, method, groups, always=False):
+        def decorator(handler):
+            hook = _Hook(cls, method, handler, groups, always)
+            self.__hooks.append(hook)
+            if always:
+                hook.install()
+            return handler
+        return decorator
+
+    def install(self, groups):
+        groups = set(groups)
+        installed = []
+        for hook in self.__hooks:
+            if hook.always or hook.groups & groups:
+                hook.install()
+                installed.append(hook.name)
+            else:
+                self.__uninstall(hook)
+        _logger.info('HookRegistry: install: %s', ', '.join(installed))
+
+    def uninstall(self):
+        for hook in self.__hooks:
+            if not hook.always:
+                self.__uninstall(hook)
+        _logger.info('HookRegistry: uninstall')
+
+    def __uninstall(self, hook):
+        if not hook.uninstall():
+            _logger.warning('HookRegistry: %s is overridden by another mod, keep it as pass-through', hook.name)
+
+
+g_hookRegistry = HookRegistry()
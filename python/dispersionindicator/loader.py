@@ -0,0 +1,46 @@
+import logging
+import sys
+from timeit import default_timer
+
+from helpers import dependency
+from skeletons.gui.app_loader import IAppLoader, GuiGlobalSpaceID
+
+from mod_constants import MOD
+
+_logger = logging.getLogger(MOD.NAME)
+
+
+class LazyLoader(object):
+    """Defers importing the manager, collector, panels and loggers to the first battle.
+
+    At client boot only the GUI space listener is registered. Entering the
+    first battle imports the manager, creates it and hands the event over;
+    the manager registers its own listeners from then on.
+    """
+
+    def __init__(self, settings):
+        self.__settings = settings
+        self.__manager = None
+        appLoader = dependency.instance(IAppLoader)
+        appLoader.onGUISpaceEntered += self.onGUISpaceEntered
+
+    @property
+    def manager(self):
+        return self.__manager
+
+    def onGUISpaceEntered(self, spaceID):
+        if self.__manager is None:
+            if spaceID != GuiGlobalSpaceID.BATTLE:
+                return
+            self.__manager = self.__loadManager()
+        self.__manager.onGUISpaceEntered(spaceID)
+
+    def __loadManager(self):
+        startTime = default_timer()
+        moduleCount = len(sys.modules)
+        from manager import IndicatorManager
+        importTime = default_timer() - startTime
+        manager = IndicatorManager(self.__settings)
+        _logger.info('LazyLoader: import manager in %.1f ms (%d modules), create in %.1f ms',
+            importTime * 1000.0, len(sys.modules) - moduleCount, (default_timer() - startTime - importTime) * 1000.0)
+        return manager
@@ -0,0 +1,79 @@
+import logging
+import os
+import json
+from datetime import datetime
+
+from mod_constants import MOD, LOG_DIR
+from logwriter import makeLogDir
+
+_logger = logging.getLogger(MOD.NAME)
+
+INDEX_FILE = os.path.join(LOG_DIR, 'index.jsonl')
+
+
+def getFileSize(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def appendRecord(record):
+    try:
+        makeLogDir(INDEX_FILE)
+        with open(INDEX_FILE, 'ab') as fp:
+            fp.write(json.dumps(record) + '\n')
+    except (IOError, OSError):
+        _logger.exception('appendRecord: failed to write %s', INDEX_FILE)
+
+
+def recordRotation(path, segmentPath):
+    """Notes that the battles indexed under path now live in segmentPath."""
+    appendRecord({
+        'date':     datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'channel':  'rotate',
+        'file':     os.path.relpath(path, LOG_DIR),
+        'segment':  os.path.relpath(segmentPath, LOG_DIR)
+    })
+
+
+class LogRecorder(object):
+    """Collects what a logger wrote in one battle and appends it to the log index.
+
+    The index is one JSON object per line, so a record is only ever appended
+    and a reader never has to open the log files themselves. offset and bytes
+    locate the battle inside a file the logger appends to.
+    """
+
+    def __init__(self, channel, path, fileFormat, names, append):
+        self.channel = channel
+        self.path = path
+        self.format = fileFormat
+        self.names = names
+        self.offset = getFileSize(path) if append else 0
+        self.startTime = None
+        self.endTime = None
+
+    def addRow(self, time):
+        if self.startTime is None:
+            self.startTime = time
+        self.endTime = time
+
+    def commit(self, vehicleName, arenaName, rows):
+        if not rows:
+            return
+        record = {
+            'date':         datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'file':         os.path.relpath(self.path, LOG_DIR),
+            'channel':      self.channel,
+            'format':       self.format,
+            'vehicle':      vehicleName,
+            'arena':        arenaName,
+            'startTime':    self.startTime,
+            'endTime':      self.endTime,
+            'rows':         rows,
+            'columns':      self.names,
+            'offset':       self.offset,
+            'bytes':        getFileSize(self.path) - self.offset
+        }
+        appendRecord(record)
@@ -0,0 +1,146 @@
+import logging
+import os
+import re
+import json
+import gzip
+import shutil
+import threading
+from datetime import datetime
+
+from mod_constants import MOD
+from logindex import getFileSize, recordRotation
+
+_logger = logging.getLogger(MOD.NAME)
+
+COMPRESSED_EXTENSION = '.gz'
+
+# one background worker per log file, kept across battles
+_workers = {}
+
+
+def compressFile(path):
+    tmpPath = path + COMPRESSED_EXTENSION + '.tmp'
+    with open(path, 'rb') as fin:
+        fout = gzip.open(tmpPath, 'wb', 6)
+        try:
+            shutil.copyfileobj(fin, fout, 1 << 16)
+        finally:
+            fout.close()
+    dstPath = path + COMPRESSED_EXTENSION
+    if os.path.exists(dstPath):
+        os.remove(dstPath)
+    os.rename(tmpPath, dstPath)
+    os.remove(path)
+    return dstPath
+
+
+class LogRotator(object):
+    """Rotates a log file that a logger appends to every battle.
+
+    After a battle the file is renamed to a segment (log.20261018-201500.csv)
+    once it has grown to maxBytes or holds maxBattles battles; the battle
+    count is kept in a sidecar file (log.csv.state). Segments are gzipped and
+    the oldest beyond backupCount removed on a background thread, so the
+    battle end only pays for a rename.
+    """
+
+    def __init__(self, path, maxBytes=0, maxBattles=0, backupCount=10, compress=True):
+        self.path = path
+        self.maxBytes = maxBytes
+        self.maxBattles = maxBattles
+        self.backupCount = backupCount
+        self.compress = compress
+        self.statePath = path + '.state'
+        root, self.extension = os.path.splitext(os.path.basename(path))
+        self.__pattern = re.compile(re.escape(root) + r'\.(\d{8}-\d{6})(?:-(\d+))?' + re.escape(self.extension)
+            + '(?:' + re.escape(COMPRESSED_EXTENSION) + ')?$')
+
+    @classmethod
+    def fromConfig(cls, path, config):
+        maxBytes = int(float(config.get('rotateSize', 0)) * 1024 * 1024)
+        maxBattles = int(config.get('rotateBattles', 0))
+        if maxBytes <= 0 and maxBattles <= 0:
+            return None
+        return cls(path, maxBytes=maxBytes, maxBattles=maxBattles,
+            backupCount=int(config.get('backupCount', 10)), compress=config.get('compress', True))
+
+    def onBattleEnd(self):
+        size = getFileSize(self.path)
+        if not size:
+            return
+        battles = self.__loadBattles() + 1
+        if (self.maxBattles > 0 and battles >= self.maxBattles) or (self.maxBytes > 0 and size >= self.maxBytes):
+            if self.__rotate():
+                battles = 0
+                self.__startWorker()
+        self.__saveBattles(battles)
+
+    def __rotate(self):
+        dirname = os.path.dirname(self.path) or '.'
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        root = '{}.{}'.format(os.path.splitext(self.path)[0], stamp)
+        # another rotation within the same second gets the next counter (log.20261018-201500-1.csv),
+        # above any still kept so the segments stay in order
+        counters = [ counter for segmentStamp, counter, _ in self.__scanSegments(dirname) if segmentStamp == stamp ]
+        if counters:
+            segment = '{}-{}{}'.format(root, max(counters) + 1, self.extension)
+        else:
+            segment = root + self.extension
+        try:
+            os.rename(self.path, segment)
+        except OSError:
+            _logger.exception('LogRotator: failed to rotate %s', self.path)
+            return False
+        _logger.info('LogRotator: %s -> %s', self.path, segment)
+        recordRotation(self.path, segment + COMPRESSED_EXTENSION if self.compress else segment)
+        return True
+
+    def __loadBattles(self):
+        try:
+            with open(self.statePath, 'rb') as fp:
+                return int(json.load(fp).get('battles', 0))
+        except (IOError, OSError, ValueError, AttributeError):
+            return 0
+
+    def __saveBattles(self, battles):
+        try:
+            with open(self.statePath, 'wb') as fp:
+                json.dump({ 'battles': battles }, fp)
+        except (IOError, OSError):
+            _logger.exception('LogRotator: failed to write %s', self.statePath)
+
+    def __startWorker(self):
+        worker = _workers.get(self.path, None)
+        if worker is not None and worker.is_alive():
+            # segments left behind are picked up by the next rotation
+            return
+        worker = threading.Thread(target=self.__run, name='{}.LogRotator'.format(MOD.NAME))
+        worker.daemon = True
+        _workers[self.path] = worker
+        worker.start()
+
+    def __scanSegments(self, dirname):
+        # (timestamp, counter, name) of every segment, oldest first
+        segments = []
+        for name in os.listdir(dirname):
+            match = self.__pattern.match(name)
+            if match:
+                segments.append((match.group(1), int(match.group(2) or 0), name))
+        return sorted(segments)
+
+    def __listSegments(self, dirname):
+        return [ name for _, _, name in self.__scanSegments(dirname) ]
+
+    def __run(self):
+        dirname = os.path.dirname(self.path) or '.'
+        try:
+            if self.compress:
+                for name in self.__listSegments(dirname):
+                    if not name.endswith(COMPRESSED_EXTENSION):
+                        compressFile(os.path.join(dirname, name))
+            if self.backupCount > 0:
+                for name in self.__listSegments(dirname)[:-self.backupCount]:
+                    _logger.info('LogRotator: remove %s', name)
+                    os.remove(os.path.join(dirname, name))
+        except:
+            _logger.exception('LogRotator: %s', self.path)
@@ -0,0 +1,130 @@
+import logging
+import os
+import csv
+import time
+import threading
+import Queue
+
+from mod_constants import MOD
+
+_logger = logging.getLogger(MOD.NAME)
+
+_STOP = object()
+
+
+def makeLogDir(path):
+    dirname = os.path.dirname(path)
+    if dirname and not os.path.isdir(dirname):
+        _logger.info('make dir %s', dirname)
+        try:
+            os.makedirs(dirname)
+        except OSError:
+            if not os.path.isdir(dirname):
+                raise
+
+
+class CsvFormat(object):
+    extension = '.csv'
+
+    def __init__(self, fp):
+        self.__writer = csv.writer(fp, dialect='excel')
+
+    def writeHeader(self, header):
+        self.__writer.writerow([ header['comment'] ])
+        self.__writer.writerow([ '#' ] + header['names'])
+        self.__writer.writerow([ '#' ] + header['units'])
+
+    def writeRows(self, rows):
+        self.__writer.writerows([ '' ] + row for row in rows)
+
+    def close(self):
+        pass
+
+
+class AsyncLogWriter(object):
+    """Appends rows to a log file from a background thread.
+
+    Rows go through a bounded queue and are written in chunks, each chunk
+    flushed to disk, so memory stays flat and an interrupted battle still
+    leaves every written chunk in the file. Rows offered while the queue is
+    full are dropped and counted.
+
+    A chunk is written once it holds chunkSize rows, or flushInterval seconds
+    after its first row arrived. Without flushInterval whatever is queued is
+    written at once.
+    """
+
+    def __init__(self, path, openMode, fileFormat, header, queueSize=4096, chunkSize=64, flushInterval=None):
+        self.path = path
+        self.openMode = openMode
+        self.fileFormat = fileFormat
+        self.header = header
+        self.chunkSize = chunkSize
+        self.flushInterval = flushInterval
+        self.writtenRows = 0
+        self.droppedRows = 0
+        self.__queue = Queue.Queue(queueSize)
+        self.__thread = None
+        self.__stopped = False
+
+    def start(self):
+        self.__thread = threading.Thread(target=self.__run, name='{}.AsyncLogWriter'.format(MOD.NAME))
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def write(self, row):
+        try:
+            self.__queue.put_nowait(row)
+        except Queue.Full:
+            self.droppedRows += 1
+
+    def stop(self):
+        if self.__thread is None:
+            return
+        self.__queue.put(_STOP)
+        self.__thread.join()
+        self.__thread = None
+        _logger.info('AsyncLogWriter.stop: %s, written=%d, dropped=%d', self.path, self.writtenRows, self.droppedRows)
+
+    def __run(self):
+        try:
+            makeLogDir(self.path)
+            with open(self.path, self.openMode) as fp:
+                writer = self.fileFormat(fp)
+                writer.writeHeader(self.header)
+                fp.flush()
+                while self.__writeChunk(writer):
+                    fp.flush()
+                writer.close()
+        except:
+            _logger.exception('AsyncLogWriter: %s', self.path)
+            self.__drain()
+
+    def __writeChunk(self, writer):
+        queue = self.__queue
+        rows = [ queue.get() ]
+        deadline = time.time() + (self.flushInterval or 0.0)
+        while len(rows) < self.chunkSize and rows[-1] is not _STOP:
+            try:
+                timeout = deadline - time.time()
+                if timeout > 0.0:
+                    rows.append(queue.get(True, timeout))
+                else:
+                    rows.append(queue.get_nowait())
+            except Queue.Empty:
+                break
+        running = rows[-1] is not _STOP
+        if not running:
+            self.__stopped = True
+            rows.pop()
+        if rows:
+            writer.writeRows(rows)
+            self.writtenRows += len(rows)
+        return running
+
+    def __drain(self):
+        # keep stop() from blocking on a full queue after a write error
+        while not self.__stopped:
+            if self.__queue.get() is _STOP:
+                break
+            self.droppedRows += 1
@@ -1,6 +1,5 @@
 
 import logging
-from functools import partial
 
 import BigWorld
 import GUI
@@ -20,9 +19,14 @@ from gui.battle_control.battle_constants import VEHICLE_VIEW_STATE, CROSSHAIR_VI
 from mod_constants import MOD, CONSTANT, CROSSHAIR_VIEW_SYMBOL, ARENA_PERIOD_SYMBOL, GUI_GLOBAL_SPACE_SYMBOL
 from statscollector import g_statsCollector
 from statsindicator import StatsIndicator
+from graphindicator import GraphIndicator
 from statslogger import StatsLogger
 from eventlogger import EventLogger
-from hook import overrideMethod
+from eventbus import EventBus
+from timerwheel import TimerWheel
+from profiler import g_profiler
+from hook import g_hookRegistry
+from expression import compileExpression
 
 _logger = logging.getLogger(MOD.NAME)
 
@@ -37,34 +41,49 @@ class IndicatorManager(object):
         self.__onShoot = None
         self.__onShot = None
         self.__onShotResult = None
-        self.__intervalHandlers = Event()
-        self.__eventHandlers = Event()
+        self.__timerWheel = None
+        self.__eventBus = EventBus()
         self.__keyHandlers = {}
-        interval = config['common']['updateInterval']
-        self.__timeInterval = TimeInterval(interval, self, 'onWatchStats')
+        self.__timeInterval = None
         g_eventBus.addListener(events.AppLifeCycleEvent.INITIALIZED, self.onAppInitialized)
         g_eventBus.addListener(events.AppLifeCycleEvent.DESTROYED, self.onAppDestroyed)
+        # onGUISpaceEntered is forwarded by LazyLoader
         appLoader = dependency.instance(IAppLoader)
-        appLoader.onGUISpaceEntered += self.onGUISpaceEntered
         appLoader.onGUISpaceLeft += self.onGUISpaceLeft
         g_statsCollector.eventHandlers.clear()
+        if config['common'].get('profile', False):
+            _logger.info('profile: enabled')
+            g_profiler.enabled = True
+            g_statsCollector.enableProfile()
 
     def initPanel(self):
         _logger.info('initPanel')
         self.addHandler()
-        g_statsCollector.eventHandlers += self.onEvent
+        g_statsCollector.eventHandlers += self.__eventBus.raiseEvent
         g_statsCollector.start()
+        sources = g_statsCollector.setRequiredStatus(self.__getRequiredStatus())
+        historyItems = self.__getHistoryItems()
+        if historyItems:
+            g_statsCollector.setHistory(historyItems, self.__config['common']['history']['capacity'])
+        g_hookRegistry.install(sources | self.__getRequiredEvents())
         g_statsCollector.updateArenaInfo()
         clientStatus = g_statsCollector.clientStatus
         self.__panels = []
         self.__keyHandlers = {}
+        self.__eventBus.clear()
+        self.__setupTimerWheel()
+        g_profiler.reset()
         for paneldef in self.__config.get('panelDefs', []):
-            if paneldef['channel'] == 'indicator':
-                panel = StatsIndicator(paneldef, clientStatus)
+            if paneldef['channel'] in ('indicator', 'graph'):
+                if paneldef['channel'] == 'graph':
+                    panel = GraphIndicator(paneldef, clientStatus)
+                else:
+                    panel = StatsIndicator(paneldef, clientStatus)
+                self.__profilePanel(panel)
                 if 'events' in paneldef:
-                    self.__eventHandlers += panel.onEvent
+                    self.__eventBus.subscribe(paneldef['events'], panel.onEvent)
                 else:
-                    self.__intervalHandlers += panel.update
+                    self.__timerWheel.add(panel.name, paneldef['updateInterval'], panel.update)
                 if 'toggleKey' in paneldef['style']:
                     keyName = paneldef['style']['toggleKey']
                     keyId = getattr(Keys, keyName)
@@ -73,10 +92,12 @@ class IndicatorManager(object):
                     self.__keyHandlers[keyId] += panel.toggle
             elif paneldef['channel'] == 'status':
                 panel = StatsLogger(paneldef, clientStatus)
-                self.__intervalHandlers += panel.update
+                self.__profilePanel(panel)
+                self.__timerWheel.add(panel.name, paneldef['updateInterval'], panel.update)
             elif paneldef['channel'] == 'event':
                 panel = EventLogger(paneldef, clientStatus)
-                self.__eventHandlers += panel.onEvent
+                self.__profilePanel(panel)
+                self.__eventBus.subscribe(paneldef['events'], panel.onEvent, coalesce=False)
             self.__panels.append(panel)
         session = dependency.instance(IBattleSessionProvider)
         ctrl = session.shared.crosshair
@@ -84,15 +105,70 @@ class IndicatorManager(object):
         self.updateScreenPosition()
         self.updateCrosshairPosition()
 
+    def __profilePanel(self, panel):
+        if not g_profiler.enabled:
+            return
+        for methodName in [ 'update', 'onEvent', 'outputLog' ]:
+            if hasattr(panel, methodName):
+                g_profiler.instrument(panel, methodName, '{}.{}[{}]'.format(panel.className, methodName, panel.name))
+
+    def __setupTimerWheel(self):
+        intervals = [ paneldef['updateInterval'] for paneldef in self.__config.get('panelDefs', []) if 'events' not in paneldef ]
+        tick = min(intervals) if intervals else self.__config['common']['updateInterval']
+        self.stopIntervalTimer()
+        self.__timerWheel = TimerWheel(tick)
+        self.__timeInterval = TimeInterval(tick, self, 'onWatchStats')
+        _logger.info('TimerWheel: tick=%s', tick)
+
+    def __getRequiredEvents(self):
+        events = set()
+        for paneldef in self.__config.get('panelDefs', []):
+            events.update(paneldef.get('events', []))
+        return events
+
+    def __getRequiredStatus(self):
+        names = set()
+        for paneldef in self.__config.get('panelDefs', []):
+            statsDefs = paneldef['statsDefs']
+            for item in paneldef['items']:
+                statDef = statsDefs.get(item, None)
+                if statDef is not None and 'expr' in statDef:
+                    names.update(compileExpression(statDef['expr'])[2])
+                else:
+                    names.add(statDef.get('status', item) if statDef is not None else item)
+            visibleControl = paneldef.get('style', {}).get('visibleControl', None)
+            if visibleControl:
+                names.add(visibleControl)
+        names.update(self.__getHistoryItems())
+        return names
+
+    def __getHistoryItems(self):
+        history = self.__config['common'].get('history', None)
+        if not history:
+            return set()
+        names = set(history['items'])
+        for paneldef in self.__config.get('panelDefs', []):
+            if paneldef['channel'] == 'graph':
+                statsDefs = paneldef['statsDefs']
+                for item in paneldef['items']:
+                    statDef = statsDefs.get(item, {})
+                    if 'expr' not in statDef:
+                        names.add(statDef.get('status', item))
+        return names
+
     def finiPanel(self):
         _logger.info('finiPanel')
         self.stopIntervalTimer()
         self.invisiblePanel()
         self.removeHandler()
-        for panel in self.__panels:
-            if isinstance(panel, EventLogger):
-                _logger.info('del EventLogger.onEvent')
-                g_statsCollector.eventHandlers -= panel.onEvent
+        g_hookRegistry.uninstall()
+        if g_profiler.enabled:
+            stats = g_statsCollector.clientStatus
+            g_profiler.writeSummary(getattr(stats, 'vehicleName', None), getattr(stats, 'arenaName', None))
+            g_profiler.reset()
+        g_statsCollector.eventHandlers -= self.__eventBus.raiseEvent
+        self.__eventBus.logCounters()
+        self.__eventBus.clear()
         self.__panels = []
         self.__keyHandlers = {}
 
@@ -149,12 +225,12 @@ class IndicatorManager(object):
             panel.stop()
 
     def startIntervalTimer(self):
-        if not self.__timeInterval.isStarted():
+        if self.__timeInterval is not None and not self.__timeInterval.isStarted():
             _logger.info('TimeInterval: start')
             self.__timeInterval.start()
 
     def stopIntervalTimer(self):
-        if self.__timeInterval.isStarted():
+        if self.__timeInterval is not None and self.__timeInterval.isStarted():
             _logger.info('TimeInterval: stop')
             self.__timeInterval.stop()
 
@@ -234,10 +310,7 @@ class IndicatorManager(object):
             panel.updateCrosshairPosition(x, y)
 
     def onWatchStats(self):
-        BigWorld.callback(0, partial(self.__intervalHandlers))
-
-    def onEvent(self, reason):
-        BigWorld.callback(0, partial(self.__eventHandlers, reason))
+        BigWorld.callback(0, self.__timerWheel.onTick)
 
     def __handleKeyEvent(self, event):
         if event.isKeyDown() and not event.isRepeatedEvent():
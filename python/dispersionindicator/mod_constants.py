@@ -20,6 +20,8 @@ CONFIG_FILES = [
 LOG_DIR = '${log_dir}'
 LOG_FILE = '${log_file}'
 
+CONFIG_CACHE_FILE = '${cache_dir}/config.pickle'
+
 CONSTANT = {
     'MS_TO_KMH':    3600.0 / 1000.0,
     'RAD_TO_DEG':   180.0 / math.pi,
@@ -86,4 +88,120 @@ CLIENT_STATUS_LIST = [
     'piercingPercent', 'targetPenetrationArmor', 'targetArmor',  'targetArmorKind', 'targetVehicleName',
     'targetHitAngleCos', 'targetHitAngle', 'targetHitAngleNormalized', 'targetPiercingPower',
     'piercingMultiplier', 'vehicleYawDelta', 'vehicleYawDeltaM', 'averageVehicleYawDelta', 'averageVehicleYawDeltaM', 'turnRadius', 'averageTurnRadius',
+    'turnCurvature', 'turnRadiusResidual',
+    'penetrationCacheHits', 'penetrationCacheMisses',
+    'profileCalls', 'profileTime', 'profileLoad',
+]
+
+FRAME_COLLECTORS = [
+    'updateDispersionAngle', 'updateAimingInfo', 'updateVehicleSpeeds', 'updateVehicleEngineState',
+    'updateGunAngles', 'updateVehicleDirection', 'updateYawChange', 'estimateTurningRadius'
+]
+
+# hook -> collector methods and events that need it installed
+HOOK_GROUPS = {
+    'ping':                 [ 'updatePing', 'updateProfile', EVENT.UPDATE_PING ],
+    'frame':                FRAME_COLLECTORS + [ EVENT.UPDATE_DISPERSION_ANGLE ],
+    'gunMarker':            [ 'updateShotInfo' ],
+    'shoot':                [ EVENT.ACTION_SHOOT ],
+    'shotResult':           [ EVENT.RECEIVE_SHOT_RESULT ],
+    'shot':                 [ EVENT.RECEIVE_SHOT ],
+    'penetration':          [ 'updatePenetrationArmor', EVENT.UPDATE_PENETRATION_ARMOR ],
+    'piercingMultiplier':   [ 'updatePiercingMultiplier', 'updatePenetrationArmor', EVENT.UPDATE_PENETRATION_ARMOR ]
+}
+
+PROFILED_METHODS = FRAME_COLLECTORS + [
+    'fireEvent', 'updateArenaInfo', 'updatePing', 'updateShotInfo', 'updatePenetrationArmor', 'updatePiercingMultiplier'
 ]
+
+CLIENT_STATUS_SOURCES = {
+    'currTime':                 'updatePing',
+    'ping':                     'updatePing',
+    'fps':                      'updatePing',
+    'fpsReplay':                'updatePing',
+    'latency':                  'updatePing',
+    'arenaName':                'updateArenaInfo',
+    'vehicleName':              'updateArenaInfo',
+    'playerTeam':               'updateArenaInfo',
+    'dAngleAiming':             'updateDispersionAngle',
+    'dAngleIdeal':              'updateDispersionAngle',
+    'turretRotationSpeed':      'updateDispersionAngle',
+    'additiveFactor':           'updateDispersionAngle',
+    'shotDispersionAngle':      'updateDispersionAngle',
+    'shotFactor':               'updateDispersionAngle',
+    'aimingStartTime':          'updateAimingInfo',
+    'aimingStartFactor':        'updateAimingInfo',
+    'multFactor':               'updateAimingInfo',
+    'factorsTurretRotation':    'updateAimingInfo',
+    'factorsMovement':          'updateAimingInfo',
+    'factorsRotation':          'updateAimingInfo',
+    'aimingTime':               'updateAimingInfo',
+    'vehicleYaw':               'updateVehicleDirection',
+    'vehiclePitch':             'updateVehicleDirection',
+    'vehicleRoll':              'updateVehicleDirection',
+    'vehicleRYaw':              'updateVehicleDirection',
+    'turretYaw':                'updateGunAngles',
+    'gunPitch':                 'updateGunAngles',
+    'vehicleSpeed':             'updateVehicleSpeeds',
+    'vehicleRSpeed':            'updateVehicleSpeeds',
+    'engineRPM':                'updateVehicleEngineState',
+    'engineRelativeRPM':        'updateVehicleEngineState',
+    'vehicleYawDelta':          'updateYawChange',
+    'vehicleYawDeltaM':         'updateYawChange',
+    'averageVehicleYawDelta':   'updateYawChange',
+    'averageVehicleYawDeltaM':  'updateYawChange',
+    'turnRadius':               'estimateTurningRadius',
+    'averageTurnRadius':        'estimateTurningRadius',
+    'turnCurvature':            'estimateTurningRadius',
+    'turnRadiusResidual':       'estimateTurningRadius',
+    'shotSpeed':                'updateShotInfo',
+    'shotSpeedH':               'updateShotInfo',
+    'shotSpeedV':               'updateShotInfo',
+    'shotGravity':              'updateShotInfo',
+    'shotSpeedC':               'updateShotInfo',
+    'shotGravityC':             'updateShotInfo',
+    'shotPosX':                 'updateShotInfo',
+    'shotPosY':                 'updateShotInfo',
+    'shotPosZ':                 'updateShotInfo',
+    'shotDistance':             'updateShotInfo',
+    'shotDistanceH':            'updateShotInfo',
+    'shotDistanceV':            'updateShotInfo',
+    'vehiclePosX':              'updateShotInfo',
+    'vehiclePosY':              'updateShotInfo',
+    'vehiclePosZ':              'updateShotInfo',
+    'distance':                 'updateShotInfo',
+    'distanceH':                'updateShotInfo',
+    'distanceV':                'updateShotInfo',
+    'targetPosX':               'updateShotInfo',
+    'targetPosY':               'updateShotInfo',
+    'targetPosZ':               'updateShotInfo',
+    'piercingPercent':          'updatePenetrationArmor',
+    'targetPenetrationArmor':   'updatePenetrationArmor',
+    'targetArmor':              'updatePenetrationArmor',
+    'targetArmorKind':          'updatePenetrationArmor',
+    'targetVehicleName':        'updatePenetrationArmor',
+    'targetHitAngleCos':        'updatePenetrationArmor',
+    'targetHitAngle':           'updatePenetrationArmor',
+    'targetHitAngleNormalized': 'updatePenetrationArmor',
+    'targetPiercingPower':      'updatePenetrationArmor',
+    'penetrationCacheHits':     'updatePenetrationArmor',
+    'penetrationCacheMisses':   'updatePenetrationArmor',
+    'piercingMultiplier':       'updatePiercingMultiplier',
+    'profileCalls':             'updateProfile',
+    'profileTime':              'updateProfile',
+    'profileLoad':              'updateProfile'
+}
+
+CLIENT_STATUS_DEPENDENCIES = {
+    'aimingFactor':             [ 'dAngleAiming', 'shotDispersionAngle' ],
+    'modifiedAimingFactor':     [ 'aimingFactor', 'multFactor' ],
+    'scoreDispersion':          [ 'modifiedAimingFactor' ],
+    'aimingTimeConverging':     [ 'aimingStartTime', 'aimingStartFactor', 'multFactor', 'aimingTime' ],
+    'flightTime':               [ 'shotDistanceH', 'shotSpeedH' ]
+}
+
+COLLECTOR_EVENTS = {
+    'updatePing':               EVENT.UPDATE_PING,
+    'updateProfile':            EVENT.UPDATE_PING,
+    'updatePenetrationArmor':   EVENT.UPDATE_PENETRATION_ARMOR
+}
@@ -0,0 +1,77 @@
+import logging
+from collections import OrderedDict
+
+import Math
+
+from mod_constants import MOD
+
+_logger = logging.getLogger(MOD.NAME)
+
+
+def _quantize(vector, step):
+    return (int(round(vector.x / step)), int(round(vector.y / step)), int(round(vector.z / step)))
+
+
+class PenetrationCache(object):
+    """Bounded LRU cache of penetration results.
+
+    Keys hold the target entity id, the hit point and shot direction in the
+    target's local frame (quantized), the distance bucket, the shell and the
+    piercing multiplier. Each entry also remembers the target health and
+    pose; an entry whose target has since taken damage or moved is a miss.
+    Switching shells clears the whole cache.
+    """
+
+    def __init__(self, maxSize=256, pointStep=0.05, directionStep=0.01, distanceStep=1.0, poseStep=0.01):
+        self.maxSize = maxSize
+        self.pointStep = pointStep
+        self.directionStep = directionStep
+        self.distanceStep = distanceStep
+        self.poseStep = poseStep
+        self.clear()
+
+    def clear(self):
+        self.__entries = OrderedDict()
+        self.__shellID = None
+        self.hits = 0
+        self.misses = 0
+
+    def makeKey(self, entity, hitPoint, direction, dist, shellID, piercingMultiplier):
+        if shellID != self.__shellID:
+            if self.__entries:
+                _logger.debug('PenetrationCache: shell changed, clear %d entries', len(self.__entries))
+            self.__entries.clear()
+            self.__shellID = shellID
+        matrix = Math.Matrix(entity.matrix)
+        matrix.invert()
+        localPoint = matrix.applyPoint(hitPoint)
+        localDirection = matrix.applyVector(direction)
+        localDirection.normalise()
+        return (
+            entity.id,
+            _quantize(localPoint, self.pointStep),
+            _quantize(localDirection, self.directionStep),
+            int(dist / self.distanceStep),
+            shellID,
+            piercingMultiplier
+        )
+
+    def __getState(self, entity):
+        position = entity.position
+        step = self.poseStep
+        return (entity.health, _quantize(position, step), int(round(entity.yaw / step)))
+
+    def get(self, key, entity):
+        entry = self.__entries.pop(key, None)
+        if entry is None or entry[0] != self.__getState(entity):
+            self.misses += 1
+            return None
+        self.__entries[key] = entry
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, entity, value):
+        entries = self.__entries
+        entries[key] = (self.__getState(entity), value)
+        if len(entries) > self.maxSize:
+            entries.popitem(last=False)
@@ -0,0 +1,89 @@
+import logging
+import os
+from datetime import datetime
+from timeit import default_timer
+
+from mod_constants import MOD, LOG_DIR
+from logwriter import makeLogDir
+
+_logger = logging.getLogger(MOD.NAME)
+
+
+class Profiler(object):
+    """Counts calls and accumulates wall time per instrumented function.
+
+    Calls nested in another measured call are reported on their own line
+    but counted only once in the totals, so totals are the mod's own time.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        self.__entries = {}
+        self.__depth = 0
+        self.__startTime = default_timer()
+        self.calls = 0
+        self.time = 0.0
+
+    @property
+    def load(self):
+        elapsed = default_timer() - self.__startTime
+        return self.time / elapsed if elapsed > 0.0 else 0.0
+
+    def call(self, name, func, *args, **kwargs):
+        self.__depth += 1
+        start = default_timer()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = default_timer() - start
+            self.__depth -= 1
+            entry = self.__entries.get(name, None)
+            if entry is None:
+                entry = self.__entries[name] = [ 0, 0.0, 0.0 ]
+            entry[0] += 1
+            entry[1] += elapsed
+            if elapsed > entry[2]:
+                entry[2] = elapsed
+            if self.__depth == 0:
+                self.calls += 1
+                self.time += elapsed
+
+    def wrap(self, name, func):
+        def wrapper(*args, **kwargs):
+            return self.call(name, func, *args, **kwargs)
+        return wrapper
+
+    def instrument(self, obj, methodName, name=None):
+        """Replaces obj.methodName by a measured wrapper on the instance."""
+        setattr(obj, methodName, self.wrap(name or methodName, getattr(obj, methodName)))
+
+    def getSummary(self):
+        elapsed = default_timer() - self.__startTime
+        lines = [
+            '# elapsed={:.3f}s calls={} time={:.3f}ms load={:.4f}%'.format(elapsed, self.calls, self.time * 1000.0, self.load * 100.0),
+            '{:48s} {:>10s} {:>12s} {:>10s} {:>10s}'.format('name', 'calls', 'total(ms)', 'mean(us)', 'max(us)')
+        ]
+        entries = sorted(self.__entries.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (calls, total, maxTime) in entries:
+            lines.append('{:48s} {:10d} {:12.3f} {:10.2f} {:10.2f}'.format(name, calls, total * 1000.0, total / calls * 1e6, maxTime * 1e6))
+        return lines
+
+    def writeSummary(self, vehicleName=None, arenaName=None):
+        if not self.__entries:
+            return
+        filename = 'profile_' + datetime.now().strftime('%Y%m%d_%H%M')
+        if vehicleName and arenaName:
+            filename += '_' + vehicleName.replace(':', '-') + '_' + arenaName
+        path = os.path.join(LOG_DIR, filename + '.txt')
+        makeLogDir(path)
+        lines = self.getSummary()
+        with open(path, 'w') as fp:
+            fp.write('\n'.join(lines) + '\n')
+        _logger.info('Profiler: %s', lines[0])
+        _logger.info('Profiler: save file: %s', path)
+
+
+g_profiler = Profiler()
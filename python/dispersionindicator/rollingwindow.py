@@ -0,0 +1,112 @@
+import math
+from collections import deque
+
+AGGREGATES = [ 'sum', 'mean', 'min', 'max', 'variance', 'stddev' ]
+
+
+class RollingWindow(object):
+    """Aggregates over the last `size` values, updated in O(1) per push."""
+
+    def __init__(self, size):
+        self.size = size
+        self.clear()
+
+    def clear(self):
+        self.__values = [ 0.0 ] * self.size
+        self.__index = 0
+        self.__serial = 0
+        # variance sums are taken around a shift near the values, so a small
+        # spread far from zero (times, positions) keeps its precision
+        self.__shift = None
+        self.__shiftedSum = 0.0
+        self.__shiftedSquares = 0.0
+        # monotonic queues of (serial, value), head is the current min / max
+        self.__minQueue = deque()
+        self.__maxQueue = deque()
+        self.count = 0
+        self.sum = 0.0
+
+    def push(self, value):
+        values = self.__values
+        index = self.__index
+        shift = self.__shift
+        if shift is None:
+            shift = self.__shift = value
+        if self.count == self.size:
+            old = values[index]
+            self.sum -= old
+            old -= shift
+            self.__shiftedSum -= old
+            self.__shiftedSquares -= old * old
+        else:
+            self.count += 1
+        values[index] = value
+        self.sum += value
+        shifted = value - shift
+        self.__shiftedSum += shifted
+        self.__shiftedSquares += shifted * shifted
+
+        serial = self.__serial
+        expired = serial - self.size
+        minQueue = self.__minQueue
+        while minQueue and minQueue[-1][1] >= value:
+            minQueue.pop()
+        minQueue.append((serial, value))
+        if minQueue[0][0] <= expired:
+            minQueue.popleft()
+        maxQueue = self.__maxQueue
+        while maxQueue and maxQueue[-1][1] <= value:
+            maxQueue.pop()
+        maxQueue.append((serial, value))
+        if maxQueue[0][0] <= expired:
+            maxQueue.popleft()
+        self.__serial = serial + 1
+
+        index += 1
+        if index == self.size:
+            index = 0
+            # once per lap, drop the rounding error of the running sums
+            # and move the shift to the current mean
+            self.sum = math.fsum(values)
+            shift = self.__shift = self.sum / self.size
+            self.__shiftedSum = math.fsum(v - shift for v in values)
+            self.__shiftedSquares = math.fsum((v - shift) * (v - shift) for v in values)
+        self.__index = index
+
+    @property
+    def last(self):
+        if not self.count:
+            return None
+        return self.__values[self.__index - 1]
+
+    @property
+    def mean(self):
+        if not self.count:
+            return None
+        return self.sum / self.count
+
+    @property
+    def min(self):
+        if not self.count:
+            return None
+        return self.__minQueue[0][1]
+
+    @property
+    def max(self):
+        if not self.count:
+            return None
+        return self.__maxQueue[0][1]
+
+    @property
+    def variance(self):
+        if not self.count:
+            return None
+        count = self.count
+        shiftedSum = self.__shiftedSum
+        return max((self.__shiftedSquares - shiftedSum * shiftedSum / count) / count, 0.0)
+
+    @property
+    def stddev(self):
+        if not self.count:
+            return None
+        return math.sqrt(self.variance)
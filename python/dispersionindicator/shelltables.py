@@ -0,0 +1,98 @@
+import logging
+import math
+
+from AvatarInputHandler.gun_marker_ctrl import _CrosshairShotResults
+from material_kinds import IDS_BY_NAMES
+
+from mod_constants import MOD
+
+_logger = logging.getLogger(MOD.NAME)
+
+PIERCING_POWER_STEP = 1.0
+
+
+class ShellTable(object):
+    """Values of one loaded shell that the penetration loop needs per collision.
+
+    shouldRicochet and computePenetrationArmor follow _CrosshairShotResults
+    with the shell's thresholds looked up once per battle.
+    """
+
+    def __init__(self, shot):
+        shell = shot.shell
+        extraData = _CrosshairShotResults._SHELL_EXTRA_DATA[shell.kind]
+        self.kind = shell.kind
+        self.caliber = shell.caliber
+        self.jetLossPPByDist = extraData.jetLossPPByDist
+        self.normAngle = extraData.normAngle
+        self.ricochetAngleCos = extraData.ricochetAngleCos
+        self.maxHitAngle = _CrosshairShotResults._MAX_HIT_ANGLE_BOUND
+        # normalization is scaled up by 1.4 * caliber / (armor * 2) on armor thinner than caliber / 2
+        self.normCaliberArmor = shell.caliber / 2.0
+        self.normCaliberFactor = 1.4 * shell.caliber / 2.0
+        self.maxDistance = shot.maxDistance
+        self.__ppDesc = shot.piercingPower
+        # the engine drops to zero at maxDistance, keep every tabulated point below it
+        count = int(math.ceil(shot.maxDistance / PIERCING_POWER_STEP))
+        self.__piercingPower = [ self.__computePiercingPower(i * PIERCING_POWER_STEP, 1.0) for i in range(count) ]
+
+    def __computePiercingPower(self, dist, piercingMultiplier):
+        return _CrosshairShotResults._computePiercingPowerAtDist(self.__ppDesc, dist, self.maxDistance, piercingMultiplier)
+
+    def shouldRicochet(self, hitAngleCos, matInfo):
+        if not matInfo.mayRicochet or hitAngleCos > self.ricochetAngleCos:
+            return False
+        return not matInfo.checkCaliberForRichet or matInfo.armor * 3 >= self.caliber
+
+    def computePenetrationArmor(self, hitAngleCos, matInfo):
+        armor = matInfo.armor
+        if not matInfo.useHitAngle:
+            return armor
+        normalizationAngle = self.normAngle
+        if normalizationAngle > 0.0 and hitAngleCos < 1.0:
+            if matInfo.checkCaliberForHitAngleNorm:
+                if self.normCaliberArmor > armor > 0:
+                    normalizationAngle *= self.normCaliberFactor / armor
+            hitAngle = math.acos(hitAngleCos) - normalizationAngle
+            if hitAngle < 0.0:
+                hitAngleCos = 1.0
+            else:
+                if hitAngle > self.maxHitAngle:
+                    hitAngle = self.maxHitAngle
+                hitAngleCos = math.cos(hitAngle)
+        if hitAngleCos < 1e-05:
+            hitAngleCos = 1e-05
+        return armor / hitAngleCos
+
+    def getPiercingPower(self, dist, piercingMultiplier):
+        position = dist / PIERCING_POWER_STEP
+        index = int(position)
+        table = self.__piercingPower
+        if dist < 0.0 or index + 1 >= len(table):
+            return self.__computePiercingPower(dist, piercingMultiplier)
+        v0 = table[index]
+        return (v0 + (table[index + 1] - v0) * (position - index)) * piercingMultiplier
+
+
+class ShellTables(object):
+    """Per-battle tables for every shell of the player's gun, built on first use."""
+
+    def __init__(self):
+        self.armorKindNames = dict((v, k) for k, v in IDS_BY_NAMES.items())
+        self.clear()
+
+    def clear(self):
+        self.__vDesc = None
+        self.__tables = {}
+
+    def get(self, vDesc):
+        if vDesc is not self.__vDesc:
+            self.__vDesc = vDesc
+            self.__tables = {}
+            for shot in vDesc.gun.shots:
+                self.__tables[shot.shell.compactDescr] = ShellTable(shot)
+            _logger.info('ShellTables: build tables for %d shells', len(self.__tables))
+        table = self.__tables.get(vDesc.shot.shell.compactDescr, None)
+        if table is None:
+            table = self.__tables[vDesc.shot.shell.compactDescr] = ShellTable(vDesc.shot)
+        return table
@@ -1,5 +1,6 @@
 import logging, math
 from datetime import datetime
+from operator import attrgetter
 import Math, BigWorld, BattleReplay
 from Event import Event
 from debug_utils import LOG_CURRENT_EXCEPTION
@@ -12,13 +13,20 @@ from gui.battle_control import avatar_getter
 from gui.battle_control.controllers.crosshair_proxy import CrosshairDataProxy
 from gui.battle_control.controllers.debug_ctrl import DebugController
 from gui.Scaleform.daapi.view.battle.shared.crosshair.plugins import ShotResultIndicatorPlugin
-from material_kinds import EFFECT_MATERIAL_INDEXES_BY_IDS, EFFECT_MATERIAL_NAMES_BY_INDEXES, IDS_BY_NAMES
+from material_kinds import EFFECT_MATERIAL_INDEXES_BY_IDS, EFFECT_MATERIAL_NAMES_BY_INDEXES
 from helpers import dependency
 from skeletons.gui.battle_session import IBattleSessionProvider
 
 
-from mod_constants import MOD, EVENT, CLIENT_STATUS_LIST
-from hook import overrideMethod, overrideClassMethod
+from mod_constants import MOD, EVENT, CLIENT_STATUS_LIST, CLIENT_STATUS_SOURCES, CLIENT_STATUS_DEPENDENCIES, FRAME_COLLECTORS, COLLECTOR_EVENTS, PROFILED_METHODS, HOOK_GROUPS
+from rollingwindow import RollingWindow
+from circlefit import CircleFit
+from penetrationcache import PenetrationCache
+from shelltables import ShellTables
+from timeseries import HistoryStore
+from expression import Expression, compileExpression
+from profiler import g_profiler
+from hook import g_hookRegistry
 
 _logger = logging.getLogger(MOD.NAME)
 
@@ -26,13 +34,17 @@ g_statsCollector = None
 
 def callOriginal(prev=False):
     def decorator(func):
+        name = func.__name__
         def wrapper(orig, *args, **kwargs):
             result = None
             if prev:
                 result = orig(*args, **kwargs)
             try:
                 if g_statsCollector is not None:
-                    _ = func(result, *args, **kwargs)
+                    if g_profiler.enabled:
+                        _ = g_profiler.call(name, func, result, *args, **kwargs)
+                    else:
+                        _ = func(result, *args, **kwargs)
             except:
                 LOG_CURRENT_EXCEPTION()
             if not prev:
@@ -42,38 +54,35 @@ def callOriginal(prev=False):
     return decorator
 
 
-@overrideMethod(DebugController, '_update')
+@g_hookRegistry.overrideMethod(DebugController, '_update', HOOK_GROUPS['ping'])
 @callOriginal(prev=False)
 def debugController_update(orig_result, self):
     g_statsCollector.updatePing()
+    g_statsCollector.updateProfile()
     g_statsCollector.fireEvent(EVENT.UPDATE_PING)
 
 
-@overrideMethod(PlayerAvatar, 'getOwnVehicleShotDispersionAngle')
+@g_hookRegistry.overrideMethod(PlayerAvatar, 'getOwnVehicleShotDispersionAngle', HOOK_GROUPS['frame'])
 @callOriginal(prev=True)
 def playerAvatar_getOwnVehicleShotDispersionAngle(orig_result, self, turretRotationSpeed, withShot=0):
     dispersionAngle = orig_result
     avatar = self
     collector = g_statsCollector
-    collector.updateDispersionAngle(avatar, dispersionAngle, turretRotationSpeed, withShot)
-    collector.updateAimingInfo(avatar)
-    collector.updateVehicleSpeeds(avatar)
-    collector.updateVehicleEngineState(avatar)
-    collector.updateGunAngles(avatar)
-    collector.updateVehicleDirection(avatar)
-    collector.updateYawChange(avatar)
-    collector.estimateTurningRadius(avatar)
+    if collector.collectDispersionAngle:
+        collector.updateDispersionAngle(avatar, dispersionAngle, turretRotationSpeed, withShot)
+    for update in collector.frameCollectors:
+        update(avatar)
     g_statsCollector.fireEvent(EVENT.UPDATE_DISPERSION_ANGLE)
 
 
-@overrideMethod(_GunControlMode, 'updateGunMarker')
+@g_hookRegistry.overrideMethod(_GunControlMode, 'updateGunMarker', HOOK_GROUPS['gunMarker'])
 @callOriginal(prev=True)
 def gunControlMode_updateGunMarker(orig_result, self, markerType, gunMarkerInfo, supportMarkersInfo, relaxTime):
     avatar = BigWorld.player()
     g_statsCollector.updateShotInfo(avatar, gunMarkerInfo.hitPoint)
 
 
-@overrideMethod(PlayerAvatar, 'shoot')
+@g_hookRegistry.overrideMethod(PlayerAvatar, 'shoot', HOOK_GROUPS['shoot'])
 @callOriginal(prev=False)
 def playerAvatar_shoot(_, self, isRepeat = False):
     if not self._PlayerAvatar__isOnArena:
@@ -106,7 +115,7 @@ def playerAvatar_shoot(_, self, isRepeat = False):
     g_statsCollector.fireEvent(EVENT.ACTION_SHOOT)
 
 
-@overrideMethod(PlayerAvatar, 'showShotResults')
+@g_hookRegistry.overrideMethod(PlayerAvatar, 'showShotResults', HOOK_GROUPS['shotResult'])
 @callOriginal(prev=False)
 def playerAvatar_showShotResults(_, self, result):
     time = BigWorld.time()
@@ -114,7 +123,7 @@ def playerAvatar_showShotResults(_, self, result):
     g_statsCollector.fireEvent(EVENT.RECEIVE_SHOT_RESULT)
 
 
-@overrideMethod(ShowShooting, '_ShowShooting__doShot')
+@g_hookRegistry.overrideMethod(ShowShooting, '_ShowShooting__doShot', HOOK_GROUPS['shot'])
 @callOriginal(prev=False)
 def showShooting_doShot(_, self, data):
     if not data['entity'].isPlayerVehicle:
@@ -124,7 +133,7 @@ def showShooting_doShot(_, self, data):
     g_statsCollector.fireEvent(EVENT.RECEIVE_SHOT)
 
 
-@overrideMethod(CrosshairDataProxy, '_CrosshairDataProxy__setGunMarkerState')
+@g_hookRegistry.overrideMethod(CrosshairDataProxy, '_CrosshairDataProxy__setGunMarkerState', HOOK_GROUPS['penetration'])
 @callOriginal(prev=True)
 def crosshairDataProxy_setGunMarkerState(orig_result, self, markerType, gunMarkerState):
     excludeTeam = g_statsCollector.clientStatus.playerTeam
@@ -147,134 +156,187 @@ def crosshairDataProxy_setGunMarkerState(orig_result, self, markerType, gunMarke
         if player is None:
             break
         vDesc = player.getVehicleDescriptor()
-        shell = vDesc.shot.shell
-        caliber = shell.caliber
-        shellKind = shell.kind
-        ppDesc = vDesc.shot.piercingPower
-        maxDist = vDesc.shot.maxDistance
         dist = (hitPoint - player.getOwnVehiclePosition()).length
-        piercingPower = _CrosshairShotResults._computePiercingPowerAtDist(ppDesc, dist, maxDist, g_statsCollector.clientStatus.piercingMultiplier)
-        fullPiercingPower = piercingPower
-        minPP, maxPP = _CrosshairShotResults._computePiercingPowerRandomization(shell)
-        isJet = False
-        jetStartDist = None
-        ignoredMaterials = set()
-        collisionsDetails = _CrosshairShotResults._getAllCollisionDetails(hitPoint, direction, entity)
-        if collisionsDetails is None:
+        piercingMultiplier = g_statsCollector.clientStatus.piercingMultiplier
+        cache = g_statsCollector.penetrationCache
+        key = cache.makeKey(entity, hitPoint, direction, dist, vDesc.shot.shell.compactDescr, piercingMultiplier)
+        cached = cache.get(key, entity)
+        if cached is not None:
+            piercingPercent, resultPenetrationInfo = cached
             break
-        for cDetails in collisionsDetails:
-            if isJet:
-                jetDist = cDetails.dist - jetStartDist
-                if jetDist > 0.0:
-                    piercingPower *= 1.0 - jetDist * _CrosshairShotResults._SHELL_EXTRA_DATA[shellKind].jetLossPPByDist
-            if cDetails.matInfo is None:
-                piercingPercent = None
-            else:
-                matInfo = cDetails.matInfo
-                if (cDetails.compName, matInfo.kind) in ignoredMaterials:
-                    continue
-                hitAngleCos = cDetails.hitAngleCos if matInfo.useHitAngle else 1.0
-                if resultPenetrationInfo.get('firstArmor', None) is None:
-                    mat_name = None
-                    for k, v in IDS_BY_NAMES.items():
-                        if v == matInfo.kind:
-                            mat_name = k
-                            break
-                    resultPenetrationInfo['firstArmor'] = {
-                        'hitAngleCos': hitAngleCos,
-                        'armor': matInfo.armor,
-                        'penetrationArmor': _CrosshairShotResults._computePenetrationArmor(shell.kind, hitAngleCos, matInfo, shell.caliber),
-                        'armorKind': mat_name,
-                        'hitAngle': math.acos(hitAngleCos),
-                        'hitAngleNormalized': computeHitAngle(shellKind, hitAngleCos, matInfo, caliber),
-                        'piercingPower': piercingPower
-                    }
-                if not isJet and _CrosshairShotResults._shouldRicochet(shellKind, hitAngleCos, matInfo, caliber):
-                    break
-                piercingPercent = 1000.0
-                if piercingPower > 0.0:
-                    penetrationArmor = _CrosshairShotResults._computePenetrationArmor(shellKind, hitAngleCos, matInfo, caliber)
-                    piercingPercent = 100.0 + (penetrationArmor - piercingPower) / fullPiercingPower * 100.0
-                    piercingPower -= penetrationArmor
-                if matInfo.vehicleDamageFactor:
-                    break
-                elif matInfo.extra:
-                    piercingPercent = None
-                if matInfo.collideOnceOnly:
-                    ignoredMaterials.add((cDetails.compName, matInfo.kind))
-            if piercingPower <= 0.0:
-                break
-            if _CrosshairShotResults._SHELL_EXTRA_DATA[shellKind].jetLossPPByDist > 0.0:
-                isJet = True
-                mInfo = cDetails.matInfo
-                armor = mInfo.armor if mInfo is not None else 0.0
-                jetStartDist = cDetails.dist + armor * 0.001                
+        piercingPercent = computePenetration(hitPoint, direction, entity, vDesc, dist, piercingMultiplier, resultPenetrationInfo)
+        cache.put(key, entity, (piercingPercent, resultPenetrationInfo))
 
     g_statsCollector.updatePenetrationArmor(piercingPercent, resultPenetrationInfo)
     g_statsCollector.fireEvent(EVENT.UPDATE_PENETRATION_ARMOR)
 
 
-@overrideMethod(ShotResultIndicatorPlugin, 'start')
+def computePenetration(hitPoint, direction, entity, vDesc, dist, piercingMultiplier, resultPenetrationInfo):
+    table = g_statsCollector.shellTables.get(vDesc)
+    shouldRicochet = table.shouldRicochet
+    computePenetrationArmor = table.computePenetrationArmor
+    jetLossPPByDist = table.jetLossPPByDist
+    piercingPercent = None
+    piercingPower = table.getPiercingPower(dist, piercingMultiplier)
+    fullPiercingPower = piercingPower
+    isJet = False
+    jetStartDist = None
+    ignoredMaterials = set()
+    collisionsDetails = _CrosshairShotResults._getAllCollisionDetails(hitPoint, direction, entity)
+    if collisionsDetails is None:
+        return None
+    for cDetails in collisionsDetails:
+        if isJet:
+            jetDist = cDetails.dist - jetStartDist
+            if jetDist > 0.0:
+                piercingPower *= 1.0 - jetDist * jetLossPPByDist
+        if cDetails.matInfo is None:
+            piercingPercent = None
+        else:
+            matInfo = cDetails.matInfo
+            if (cDetails.compName, matInfo.kind) in ignoredMaterials:
+                continue
+            hitAngleCos = cDetails.hitAngleCos if matInfo.useHitAngle else 1.0
+            penetrationArmor = None
+            if resultPenetrationInfo.get('firstArmor', None) is None:
+                penetrationArmor = computePenetrationArmor(hitAngleCos, matInfo)
+                hitAngle = math.acos(hitAngleCos)
+                resultPenetrationInfo['firstArmor'] = {
+                    'hitAngleCos': hitAngleCos,
+                    'armor': matInfo.armor,
+                    'penetrationArmor': penetrationArmor,
+                    'armorKind': g_statsCollector.shellTables.armorKindNames.get(matInfo.kind, None),
+                    'hitAngle': hitAngle,
+                    'hitAngleNormalized': computeHitAngle(table, hitAngle, hitAngleCos, matInfo),
+                    'piercingPower': piercingPower
+                }
+            if not isJet and shouldRicochet(hitAngleCos, matInfo):
+                break
+            piercingPercent = 1000.0
+            if piercingPower > 0.0:
+                if penetrationArmor is None:
+                    penetrationArmor = computePenetrationArmor(hitAngleCos, matInfo)
+                piercingPercent = 100.0 + (penetrationArmor - piercingPower) / fullPiercingPower * 100.0
+                piercingPower -= penetrationArmor
+            if matInfo.vehicleDamageFactor:
+                break
+            elif matInfo.extra:
+                piercingPercent = None
+            if matInfo.collideOnceOnly:
+                ignoredMaterials.add((cDetails.compName, matInfo.kind))
+        if piercingPower <= 0.0:
+            break
+        if jetLossPPByDist > 0.0:
+            isJet = True
+            mInfo = cDetails.matInfo
+            armor = mInfo.armor if mInfo is not None else 0.0
+            jetStartDist = cDetails.dist + armor * 0.001
+    return piercingPercent
+
+
+@g_hookRegistry.overrideMethod(ShotResultIndicatorPlugin, 'start', HOOK_GROUPS['piercingMultiplier'], always=True)
 @callOriginal(prev=True)
 def shotResultIndicatorPlugin_start(orig_result, self):
     g_statsCollector.updatePiercingMultiplier(self._ShotResultIndicatorPlugin__piercingMultiplier)
 
 
-@overrideMethod(ShotResultIndicatorPlugin, '_ShotResultIndicatorPlugin__onVehicleFeedbackReceived')
+@g_hookRegistry.overrideMethod(ShotResultIndicatorPlugin, '_ShotResultIndicatorPlugin__onVehicleFeedbackReceived', HOOK_GROUPS['piercingMultiplier'], always=True)
 @callOriginal(prev=True)
 def shotResultIndicatorPlugin_onVehicleFeedbackReceived(orig_result, self, eventID, _, value):
     g_statsCollector.updatePiercingMultiplier(self._ShotResultIndicatorPlugin__piercingMultiplier)
 
 
 # code from scripts/client/AvatarInputHandler/gun_marker_ctrl.py _CrosshairShotResults._computePenetrationArmor
-def computeHitAngle(shellKind, hitAngleCos, matInfo, caliber):
+def computeHitAngle(table, hitAngle, hitAngleCos, matInfo):
     armor = matInfo.armor
     if not matInfo.useHitAngle:
-        return math.acos(hitAngleCos)
-    normalizationAngle = _CrosshairShotResults._SHELL_EXTRA_DATA[shellKind].normAngle
+        return hitAngle
+    normalizationAngle = table.normAngle
     if normalizationAngle > 0.0 and hitAngleCos < 1.0:
         if matInfo.checkCaliberForHitAngleNorm:
-            if caliber > armor * 2 > 0:
-                normalizationAngle *= 1.4 * caliber / (armor * 2)
-        hitAngle = math.acos(hitAngleCos) - normalizationAngle
+            if table.normCaliberArmor > armor > 0:
+                normalizationAngle *= table.normCaliberFactor / armor
+        hitAngle -= normalizationAngle
         if hitAngle < 0.0:
             hitAngle = 0.0
-        else:
-            if hitAngle > _CrosshairShotResults._MAX_HIT_ANGLE_BOUND:
-                hitAngle = _CrosshairShotResults._MAX_HIT_ANGLE_BOUND
-    else:
-        hitAngle = math.acos(hitAngleCos)
+        elif hitAngle > table.maxHitAngle:
+            hitAngle = table.maxHitAngle
     return hitAngle
 
 
+def _frameCached(key):
+    """Caches a computed property until key(clientStatus) changes; the value
+    and the key live in the extra slots <name>Value and <name>Key."""
+    def decorator(func):
+        valueName = func.__name__ + 'Value'
+        keyName = func.__name__ + 'Key'
+        def getter(self):
+            current = key(self)
+            if getattr(self, keyName) == current:
+                return getattr(self, valueName)
+            value = func(self)
+            setattr(self, valueName, value)
+            setattr(self, keyName, current)
+            return value
+        return property(getter)
+    return decorator
+
+
+_byVersion = attrgetter('frameVersion')
+
+
+def _byTick(stats):
+    return BigWorld.time()
+
+
+def _byVersionAndTick(stats):
+    return (stats.frameVersion, BigWorld.time())
+
+
+CACHED_PROPERTIES = [
+    'localDateTime', 'aimingFactor', 'aimingTimeConverging', 'modifiedAimingFactor', 'scoreDispersion', 'flightTime'
+]
+
+
 class ClientStatus(object):
-    __slots__ = CLIENT_STATUS_LIST
+    """Latest collected values, plus computed properties cached per frame.
 
-    @property
+    StatsCollector bumps frameVersion whenever it writes, so a computed
+    property runs at most once per write however many panels and loggers read
+    it. Properties that depend on the clock are also keyed on BigWorld.time().
+    """
+    __slots__ = CLIENT_STATUS_LIST + [ 'frameVersion' ] + [ name + suffix for name in CACHED_PROPERTIES for suffix in ('Value', 'Key') ]
+
+    def __init__(self):
+        self.frameVersion = 0
+        for name in CACHED_PROPERTIES:
+            setattr(self, name + 'Key', None)
+
+    @_frameCached(_byTick)
     def localDateTime(self):
         return datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:23]
 
-    @property
+    @_frameCached(_byVersion)
     def aimingFactor(self):
         return self.dAngleAiming / self.shotDispersionAngle
 
-    @property
+    @_frameCached(_byVersionAndTick)
     def aimingTimeConverging(self):
         factor = self.aimingStartFactor / self.multFactor
         return max(self.aimingStartTime + self.aimingTime * math.log(factor) - BigWorld.time(), 0)
 
-    @property
+    @_frameCached(_byVersion)
     def modifiedAimingFactor(self):
         return self.aimingFactor / self.multFactor
 
-    @property
+    @_frameCached(_byVersion)
     def scoreDispersion(self):
         k = 1.0
         fm = 16.0
         fc = self.modifiedAimingFactor
         return (fc ** k - 1.0) / (fm ** k - 1.0) * 100.0
 
-    @property
+    @_frameCached(_byVersion)
     def flightTime(self):
         return self.shotDistanceH / self.shotSpeedH
 
@@ -282,24 +344,121 @@ class ClientStatus(object):
 class StatsCollector(object):
     def __init__(self):
         self.clientStatus = None
+        self.piercingMultiplier = 1.0
         self.eventHandlers = Event()
         self.previousTimestamp = BigWorld.time()
         self.previousYaw = 0
-        self.yawDeltas = []
-        self.timeDeltas = []
-        self.vehiclePositions = []
-        self.timestamps = []
+        self.yawDeltas = RollingWindow(50)
+        self.timeDeltas = RollingWindow(50)
+        self.turningCircle = CircleFit(3)
+        self.averageTurningCircle = CircleFit(20)
+        self.penetrationCache = PenetrationCache()
+        self.shellTables = ShellTables()
+        self.history = HistoryStore()
+        self.__windows = {}
+        self.__windowsByEvent = {}
+        self.__expressions = {}
+        self.__expressionsByEvent = {}
+        self.setFrameCollectors(FRAME_COLLECTORS)
         return
 
     def start(self):
         self.clientStatus = ClientStatus()
+        # the plugin may report its multiplier before the collector starts
+        self.clientStatus.piercingMultiplier = self.piercingMultiplier
+        self.turningCircle.clear()
+        self.averageTurningCircle.clear()
+        self.penetrationCache.clear()
+        self.shellTables.clear()
+        self.history.clear()
+        self.__windows = {}
+        self.__windowsByEvent = {}
+        self.__expressions = {}
+        self.__expressionsByEvent = {}
+
+    def getWindow(self, statusName, size):
+        key = (statusName, size)
+        window = self.__windows.get(key, None)
+        if window is None:
+            window = self.__windows[key] = RollingWindow(size)
+            event = COLLECTOR_EVENTS.get(self.__getSource(statusName), EVENT.UPDATE_DISPERSION_ANGLE)
+            self.__windowsByEvent.setdefault(event, []).append((attrgetter(statusName), window))
+            _logger.info('add window: %s[%d] on %s', statusName, size, event)
+        return window
+
+    def getExpression(self, source):
+        key, function, names = compileExpression(source)
+        expression = self.__expressions.get(key, None)
+        if expression is None:
+            expression = self.__expressions[key] = Expression(source, function)
+            events = set(COLLECTOR_EVENTS.get(self.__getSource(name), EVENT.UPDATE_DISPERSION_ANGLE) for name in names)
+            for event in events:
+                self.__expressionsByEvent.setdefault(event, []).append(expression)
+            _logger.info('add expression: %s on %s', source, ', '.join(sorted(events)))
+        return expression
+
+    def setHistory(self, names, capacity):
+        namesByEvent = {}
+        for statusName in sorted(set(names)):
+            event = COLLECTOR_EVENTS.get(self.__getSource(statusName), EVENT.UPDATE_DISPERSION_ANGLE)
+            namesByEvent.setdefault(event, []).append(statusName)
+        self.history.setFields(namesByEvent, capacity)
+        for event, statusNames in namesByEvent.items():
+            _logger.info('add history: %s[%d] on %s', ', '.join(statusNames), capacity, event)
+
+    def __getSource(self, statusName):
+        pending = [ statusName ]
+        while pending:
+            name = pending.pop(0)
+            if name in CLIENT_STATUS_SOURCES:
+                return CLIENT_STATUS_SOURCES[name]
+            pending.extend(CLIENT_STATUS_DEPENDENCIES.get(name, []))
+        return None
+
+    def __feedWindows(self, windows):
+        stats = self.clientStatus
+        for getter, window in windows:
+            try:
+                value = getter(stats)
+            except (AttributeError, TypeError, ZeroDivisionError):
+                continue
+            if value is not None:
+                window.push(value)
+
+    def setRequiredStatus(self, names):
+        sources = set()
+        pending = list(names)
+        visited = set()
+        while pending:
+            name = pending.pop()
+            if name in visited:
+                continue
+            visited.add(name)
+            pending.extend(CLIENT_STATUS_DEPENDENCIES.get(name, []))
+            if name in CLIENT_STATUS_SOURCES:
+                sources.add(CLIENT_STATUS_SOURCES[name])
+        self.setFrameCollectors([ name for name in FRAME_COLLECTORS if name in sources ])
+        return sources
+
+    def setFrameCollectors(self, names):
+        _logger.info('frame collectors: %s', ', '.join(names))
+        self.collectDispersionAngle = 'updateDispersionAngle' in names
+        self.frameCollectors = [ getattr(self, name) for name in names if name != 'updateDispersionAngle' ]
 
     def fireEvent(self, reason):
-        info = {
-            'eventTime': BigWorld.time(),
-            'eventName': reason
-        }
-        self.eventHandlers(info)
+        stats = self.clientStatus
+        if stats is not None:
+            stats.frameVersion += 1
+        expressions = self.__expressionsByEvent.get(reason, None)
+        if expressions:
+            for expression in expressions:
+                expression.evaluate(stats)
+        windows = self.__windowsByEvent.get(reason, None)
+        if windows:
+            self.__feedWindows(windows)
+        eventTime = BigWorld.time()
+        self.history.push(reason, eventTime, self.clientStatus)
+        self.eventHandlers(reason, eventTime)
 
     def updateArenaInfo(self):
         stats = self.clientStatus
@@ -309,6 +468,7 @@ class StatsCollector(object):
         stats.vehicleName = avatar_getter.getVehicleTypeDescriptor().type.name
         session = dependency.instance(IBattleSessionProvider)
         stats.playerTeam  = session.getArenaDP().getNumberOfTeam()
+        stats.frameVersion += 1
 
     def updatePing(self):
         stats = self.clientStatus
@@ -334,6 +494,19 @@ class StatsCollector(object):
         latency = BigWorld.LatencyInfo().value
         stats.latency = latency[3]
 
+    def updateProfile(self):
+        stats = self.clientStatus
+        if stats is None or not g_profiler.enabled:
+            return
+        stats.profileCalls = g_profiler.calls
+        stats.profileTime = g_profiler.time * 1000.0
+        stats.profileLoad = g_profiler.load * 100.0
+
+    def enableProfile(self):
+        for name in PROFILED_METHODS:
+            g_profiler.instrument(self, name, 'StatsCollector.' + name)
+        self.setFrameCollectors(FRAME_COLLECTORS)
+
     def updateDispersionAngle(self, avatar, dispersionAngle, turretRotationSpeed, withShot):
         stats = self.clientStatus
         if stats is None:
@@ -410,14 +583,10 @@ class StatsCollector(object):
                 stats.vehicleYawDelta = yawDelta / timeDelta
             self.previousTimestamp = currentTimestamp
             self.previousYaw = currentYaw
-            if len(self.yawDeltas) >= 50:
-                self.yawDeltas.pop(0)
-            self.yawDeltas.append(yawDelta)
-            if len(self.timeDeltas) >= 50:
-                self.timeDeltas.pop(0)
-            self.timeDeltas.append(timeDelta)
-            averageYawDelta = sum(self.yawDeltas) / len(self.yawDeltas)
-            averageTimeDelta = sum(self.timeDeltas) / len(self.timeDeltas)
+            self.yawDeltas.push(yawDelta)
+            self.timeDeltas.push(timeDelta)
+            averageYawDelta = self.yawDeltas.mean
+            averageTimeDelta = self.timeDeltas.mean
             if averageTimeDelta == 0:
                 stats.averageVehicleYawDelta = 0
             else:
@@ -428,35 +597,13 @@ class StatsCollector(object):
         stats = self.clientStatus
         if stats is None:
             return
-        else:
-            position = avatar.getOwnVehiclePosition()
-            if len(self.vehiclePositions) >= 20:
-                self.vehiclePositions.pop(0)
-            self.vehiclePositions.append(position)
-            if len(self.vehiclePositions) < 3:
-                return
-
-            def radiusOfTriangle(v0, v1, v2):
-                A = (v0 - v1).length
-                B = (v1 - v2).length
-                C = (v2 - v0).length
-                s = 0.5 * (A + B + C)
-                K = math.sqrt(max(0.0, s * (s - A) * (s - B) * (s - C)))
-                if K == 0:
-                    return 0
-                return A * B * C / (4 * K)
-
-            last3Points = self.vehiclePositions[-3:]
-            stats.turnRadius = radiusOfTriangle(last3Points[0], last3Points[1], last3Points[2])
-            averageRadiusEstimate = 0
-            for i in range(len(self.vehiclePositions) - 2):
-                v0 = self.vehiclePositions[i]
-                v1 = self.vehiclePositions[i + 1]
-                v2 = self.vehiclePositions[i + 2]
-                averageRadiusEstimate += radiusOfTriangle(v0, v1, v2)
-
-            stats.averageTurnRadius = averageRadiusEstimate / (len(self.vehiclePositions) - 2)
-            return
+        position = avatar.getOwnVehiclePosition()
+        self.turningCircle.push(position.x, position.z)
+        self.averageTurningCircle.push(position.x, position.z)
+        stats.turnRadius = self.turningCircle.radius
+        stats.averageTurnRadius = self.averageTurningCircle.radius
+        stats.turnCurvature = self.averageTurningCircle.curvature
+        stats.turnRadiusResidual = self.averageTurningCircle.residual
 
     def updateGunAngles(self, avatar):
         stats = self.clientStatus
@@ -522,12 +669,15 @@ class StatsCollector(object):
         stats.targetPosX = hitPoint.x
         stats.targetPosY = hitPoint.y
         stats.targetPosZ = hitPoint.z
+        stats.frameVersion += 1
 
     def updatePenetrationArmor(self, piercingPercent, penetrationInfo):
         stats = self.clientStatus
         if stats is None:
             return
         stats.piercingPercent = piercingPercent
+        stats.penetrationCacheHits = self.penetrationCache.hits
+        stats.penetrationCacheMisses = self.penetrationCache.misses
         if 'firstArmor' in penetrationInfo:
             stats.targetHitAngleCos = penetrationInfo['firstArmor']['hitAngleCos']
             stats.targetHitAngle = penetrationInfo['firstArmor']['hitAngle']
@@ -548,10 +698,12 @@ class StatsCollector(object):
             stats.targetVehicleName = None
 
     def updatePiercingMultiplier(self, piercingMultiplier):
+        self.piercingMultiplier = piercingMultiplier
         stats = self.clientStatus
         if stats is None:
             return
         stats.piercingMultiplier = piercingMultiplier
+        stats.frameVersion += 1
 
 
 g_statsCollector = StatsCollector()
@@ -4,6 +4,7 @@ import json
 import re
 import weakref
 from functools import partial
+from operator import attrgetter
 
 import GUI
 from helpers import dependency
@@ -21,6 +22,52 @@ SWF_PATH = '${flash_dir}'
 
 MINUS_ZERO = re.compile(r'\A-(0(.0*)?)\Z')
 
+
+def _compileGetter(clientStatus, statusName, factor=None):
+    get = attrgetter(statusName)
+    if factor is None:
+        def getter():
+            try:
+                return get(clientStatus)
+            except AttributeError:
+                return None
+    else:
+        def getter():
+            try:
+                value = get(clientStatus)
+            except AttributeError:
+                return None
+            if value is None:
+                return None
+            return value * factor
+    return getter
+
+
+def _compileFormatter(template, onError):
+    if template is None:
+        return str
+    format = template.format
+    def formatter(value):
+        try:
+            text = format(value)
+        except:
+            onError()
+            return str(value)
+        if text[:1] == '-':
+            text = MINUS_ZERO.sub(r'\1', text)
+        return text
+    return formatter
+
+
+def _compileTextGetter(getter, formatter):
+    def textGetter():
+        value = getter()
+        if value is None:
+            return ''
+        return formatter(value)
+    return textGetter
+
+
 class StatsIndicatorMeta(object):
     onEvent = None
 
@@ -36,7 +83,7 @@ class StatsIndicatorMeta(object):
             if statDef is None:
                 continue
             self.__statsTable[key] = desc = {}
-            for tag in ['status', 'title', 'label', 'unit', 'format']:
+            for tag in ['status', 'expr', 'title', 'label', 'unit', 'format']:
                 if tag in statDef:
                     desc[tag] = statDef[tag]
             factor = statDef.get('factor', None)
@@ -44,7 +91,36 @@ class StatsIndicatorMeta(object):
                 factor = CONSTANT.get(factor, None)
             if factor is not None:
                 desc['factor'] = factor
-        
+            if 'window' in statDef:
+                desc['window'] = statDef['window']
+        self.__accessors = {}
+        self.statsAccessors = [ self.__getAccessor(key) for key in config['items'] ]
+        self.__valueGetters = [ getter for _, getter, _ in self.statsAccessors ]
+
+    def __getAccessor(self, name):
+        accessor = self.__accessors.get(name, None)
+        if accessor is None:
+            accessor = self.__accessors[name] = self.__compileAccessor(name)
+        return accessor
+
+    def __compileAccessor(self, name):
+        desc = self.__statsTable.get(name, {})
+        statusName = desc.get('status', name)
+        if 'window' in desc:
+            from statscollector import g_statsCollector
+            window = g_statsCollector.getWindow(statusName, desc['window']['size'])
+            getter = _compileGetter(window, desc['window'].get('agg', 'mean'), desc.get('factor', None))
+        elif 'expr' in desc:
+            from statscollector import g_statsCollector
+            expression = g_statsCollector.getExpression(desc['expr'])
+            getter = _compileGetter(expression, 'value', desc.get('factor', None))
+        else:
+            getter = _compileGetter(self.__vehicleStats, statusName, desc.get('factor', None))
+        def onError():
+            _logger.error('%s.getStatusAsText: "%s"', self.className, json.dumps(desc))
+        formatter = _compileFormatter(desc.get('format', None), onError)
+        return name, getter, _compileTextGetter(getter, formatter)
+
     @property
     def vehicleStats(self):
         return self.__vehicleStats
@@ -56,35 +132,13 @@ class StatsIndicatorMeta(object):
         return desc.get('unit', default)
 
     def getStatus(self, name):
-        desc = self.__statsTable.get(name, None)
-        statusName = desc['status'] if desc is not None else name
-        try:
-            value = getattr(self.__vehicleStats, statusName, None)
-        except AttributeError:
-            _logger.error('%s.getStatus: unknown status name "%s"', self.className, statusName)
-            return None
-        if value is None:
-            return None
-        if desc is not None and 'factor' in desc:
-            value *= desc['factor']
-        return value
+        return self.__getAccessor(name)[1]()
 
     def getStatusAsText(self, name):
-        desc = self.__statsTable.get(name, {})
-        template = desc.get('format', None)
-        value = self.getStatus(name)
-        if value is None:
-            return ''
-        if template is not None:
-            try:
-                text = template.format(value)
-                text = MINUS_ZERO.sub(r'\1', text)
-            except:
-                _logger.error('%s.getStatusAsText: "%s"', self.className, json.dumps(desc))
-                text = str(value)
-        else:
-            text = str(value)
-        return text
+        return self.__getAccessor(name)[2]()
+
+    def getStatusValues(self):
+        return [ getter() for getter in self.__valueGetters ]
 
     def start(self):
         self.panelState = 'START'
@@ -114,10 +168,16 @@ class StatsIndicator(StatsIndicatorMeta):
         self.__guiSettings = {}
         self.__guiSettings['style'] = config['style']
         self.__guiSettings['stats'] = []
+        if 'graph' in config:
+            self.__guiSettings['graph'] = config['graph']
         self.__statsSource = {}
         self.__visibleControl = config['style'].get('visibleControl', None)
         self.__visibleByVisibleControl = True
         self.__visibleByToggle = config['style'].get('visible', True)
+        self.__lastValues = {}
+        self.__lastVisible = None
+        self.sentCount = 0
+        self.suppressedCount = 0
         for key in config['items']:
             setting = self.statsdefs[key]
             self.__guiSettings['stats'].append({
@@ -141,28 +201,51 @@ class StatsIndicator(StatsIndicatorMeta):
 
     def onCreated(self, pyEntity):
         #_logger.info('%s.onCreated: "%s"', self.className, self.name)
+        self.__resetSentValues()
         self.updateVisible()
 
+    def start(self):
+        super(StatsIndicator, self).start()
+        self.__resetSentValues()
+
     def stop(self):
         super(StatsIndicator, self).stop()
+        _logger.info('%s.stop: "%s" sent=%d, suppressed=%d', self.className, self.name, self.sentCount, self.suppressedCount)
+        self.__setVisible(False)
+
+    def __resetSentValues(self):
+        # values pushed before the view is populated are dropped by PanelView,
+        # so forget what was sent and push everything again on next update
+        self.__lastValues = {}
+        self.__lastVisible = None
+
+    def __setIndicatorValues(self, values):
         try:
-            self.__pyEntity.setVisible(False)
+            self.__pyEntity.as_setValuesS(values)
         except weakref.ReferenceError:
             pass
 
-    def __setIndicatorValue(self, name, value):
+    def setGraph(self, name, points):
         try:
-            self.__pyEntity.as_setValueS(name, value)
+            self.__pyEntity.as_setGraphS(name, points)
         except weakref.ReferenceError:
             pass
 
     def update(self):
         if self.panelState != 'START':
             return
-        for conf in self.__guiSettings['stats']:
-            name = conf['name']
-            text = self.getStatusAsText(name)
-            self.__setIndicatorValue(name, text)
+        lastValues = self.__lastValues
+        values = {}
+        for name, _, getText in self.statsAccessors:
+            text = getText()
+            if lastValues.get(name, None) == text:
+                continue
+            lastValues[name] = text
+            values[name] = text
+        self.suppressedCount += len(self.statsAccessors) - len(values)
+        if values:
+            self.sentCount += len(values)
+            self.__setIndicatorValues(values)
         self.updateVisible()
 
     def updateScreenPosition(self, width, height):
@@ -189,8 +272,14 @@ class StatsIndicator(StatsIndicatorMeta):
                 self.__visibleByVisibleControl = True
             else:
                 self.__visibleByVisibleControl = False
+        visible = self.__visibleByToggle and self.__visibleByVisibleControl
+        if visible == self.__lastVisible:
+            return
+        self.__setVisible(visible)
+
+    def __setVisible(self, visible):
+        self.__lastVisible = visible
         try:
-            visible = self.__visibleByToggle and self.__visibleByVisibleControl
             self.__pyEntity.setVisible(visible)
         except weakref.ReferenceError:
             pass
@@ -202,10 +291,8 @@ class StatsIndicator(StatsIndicatorMeta):
         except weakref.ReferenceError:
             pass
 
-    def onEvent(self, reason):
-        #_logger.debug('%s.onEvent: receive event: %s, %s', self.className, reason['eventTime'], reason['eventName'])
-        if reason['eventName'] not in self.acceptEvents:
-            return
+    def onEvent(self, eventName, eventTime):
+        #_logger.debug('%s.onEvent: receive event: %s, %s', self.className, eventTime, eventName)
         self.update()
 
     def toggle(self):
@@ -8,47 +8,96 @@ import BigWorld
 from gui.battle_control import avatar_getter
 
 from statsindicator import StatsIndicatorMeta
+from logwriter import AsyncLogWriter, CsvFormat, makeLogDir
+from binarylog import BinaryFormat
+from logindex import LogRecorder
+from logrotate import LogRotator
 from mod_constants import MOD, LOG_DIR
 
 _logger = logging.getLogger(MOD.NAME)
 
 FILE_EXTENSION = '.csv'
 
+LOG_FORMATS = {
+    'csv':      CsvFormat,
+    'binary':   BinaryFormat
+}
+
 class StatsLogger(StatsIndicatorMeta):
     def __init__(self, config, clientStatus):
         super(StatsLogger, self).__init__(config, clientStatus)
         self.names = config['items']
         self.header = ['#'] + self.names
         self.unit = ['#'] + list(map(lambda x: self.getUnit(x, ''), self.names))
+        formatName = config.get('format', 'csv')
+        self.fileFormat = LOG_FORMATS.get(formatName, None)
+        if self.fileFormat is None:
+            _logger.error('%s.__init__: unknown format "%s", use csv', self.className, formatName)
+            formatName = 'csv'
+            self.fileFormat = CsvFormat
+        self.formatName = formatName
         if 'logfile' in config:
             filename = config['logfile']
             self.openMode = 'ab'
         else:
-            filename = datetime.now().strftime('%Y%m%d_%H%M_') + self.getStatus('vehicleName').replace(':', '-') + '_' + self.getStatus('arenaName') + FILE_EXTENSION
+            filename = datetime.now().strftime('%Y%m%d_%H%M_') + self.getStatus('vehicleName').replace(':', '-') + '_' + self.getStatus('arenaName') + self.fileFormat.extension
             self.openMode = 'wb'
         self.logFile = os.path.join(LOG_DIR, filename)
+        self.rotator = LogRotator.fromConfig(self.logFile, config) if self.openMode == 'ab' else None
+        self.stream = config.get('stream', False)
+        self.chunkSize = config.get('chunkSize', 64)
+        self.flushInterval = config.get('flushInterval', None)
+        self.__writer = None
+        self.__recorder = None
+
+    def __getHeader(self):
+        vehicleName = self.getStatus('vehicleName')
+        arenaName = self.getStatus('arenaName')
+        return {
+            'comment':      '# vehicle={} arena={}'.format(vehicleName, arenaName),
+            'vehicleName':  vehicleName,
+            'arenaName':    arenaName,
+            'names':        self.names,
+            'units':        self.unit[1:]
+        }
 
     def start(self):
         super(StatsLogger, self).start()
         self.__strage = []
+        self.__recorder = LogRecorder('status', self.logFile, self.formatName, self.names, self.openMode == 'ab')
+        if self.stream:
+            self.__writer = AsyncLogWriter(self.logFile, self.openMode, self.fileFormat, self.__getHeader(),
+                chunkSize=self.chunkSize, flushInterval=self.flushInterval)
+            self.__writer.start()
 
     def stop(self):
         super(StatsLogger, self).stop()
-        self.outputLog()
+        if self.stream:
+            if self.__writer is None:
+                return
+            self.__writer.stop()
+            rows = self.__writer.writtenRows
+            self.__writer = None
+        else:
+            self.outputLog()
+            rows = len(self.__strage)
+        self.__recorder.commit(self.getStatus('vehicleName'), self.getStatus('arenaName'), rows)
+        if self.rotator is not None:
+            self.rotator.onBattleEnd()
    
     def update(self):
-        data = [ self.getStatus(key) for key in self.names ]
-        data.insert(0, '')
-        self.__strage.append(data)
+        data = self.getStatusValues()
+        self.__recorder.addRow(BigWorld.time())
+        if self.__writer is not None:
+            self.__writer.write(data)
+        else:
+            self.__strage.append(data)
     
     def outputLog(self):
-        if not os.path.isdir(LOG_DIR):
-            _logger.info('%s.outputLog: make dir %s', self.className, LOG_DIR)
-            os.makedirs(LOG_DIR)
+        makeLogDir(self.logFile)
         _logger.info('%s.outputLog: save file: %s, %s', self.className, self.logFile, len(self.__strage))
         with open(self.logFile, self.openMode) as fp:
-            writer = csv.writer(fp, dialect='excel')
-            writer.writerow(['# vehicle={} arena={}'.format(self.getStatus('vehicleName'), self.getStatus('arenaName'))])
-            writer.writerow(self.header)
-            writer.writerow(self.unit)
-            writer.writerows(self.__strage)
+            writer = self.fileFormat(fp)
+            writer.writeHeader(self.__getHeader())
+            writer.writeRows(self.__strage)
+            writer.close()
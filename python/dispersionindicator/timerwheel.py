@@ -0,0 +1,56 @@
+import logging
+from fractions import gcd
+
+from debug_utils import LOG_CURRENT_EXCEPTION
+
+from mod_constants import MOD
+
+_logger = logging.getLogger(MOD.NAME)
+
+
+class TimerWheel(object):
+    """Calls handlers at their own interval from a single periodic tick.
+
+    Intervals are rounded to a whole number of ticks (at least one). Each
+    handler starts on the offset within its period that currently has the
+    fewest handlers due, so handlers sharing a period spread over the ticks
+    instead of all firing on the same one.
+    """
+
+    def __init__(self, tick):
+        self.tick = tick
+        self.clear()
+
+    def clear(self):
+        self.__count = 0
+        self.__entries = []
+        self.__buckets = {}
+
+    def add(self, name, interval, handler):
+        period = max(1, int(round(interval / self.tick)))
+        first = self.__count + 1
+        start = min(range(first, first + period), key=lambda i: self.__load(period, i))
+        entry = (period, start, handler)
+        self.__entries.append(entry)
+        self.__buckets.setdefault(start, []).append(entry)
+        _logger.info('TimerWheel: add %s every %d ticks (offset %d)', name, period, start - first)
+
+    def __load(self, period, start):
+        # number of handlers that ever fire on the same tick as (period, start)
+        load = 0
+        for otherPeriod, otherStart, _ in self.__entries:
+            if (start - otherStart) % gcd(period, otherPeriod) == 0:
+                load += 1
+        return load
+
+    def onTick(self):
+        self.__count += 1
+        entries = self.__buckets.pop(self.__count, None)
+        if not entries:
+            return
+        for entry in entries:
+            self.__buckets.setdefault(self.__count + entry[0], []).append(entry)
+            try:
+                entry[2]()
+            except:
+                LOG_CURRENT_EXCEPTION()
@@ -0,0 +1,188 @@
+from array import array
+from operator import attrgetter
+
+NAN = float('nan')
+
+
+DOWNSAMPLE_METHODS = [ 'minmax', 'lttb' ]
+
+
+def _dropNaN(times, values):
+    if all(value == value for value in values):
+        return times, values
+    keep = [ i for i, value in enumerate(values) if value == value ]
+    return array('d', [ times[i] for i in keep ]), array('d', [ values[i] for i in keep ])
+
+
+def minMaxBuckets(times, values, points):
+    """Keeps the min and max of points / 2 buckets in time order, so peaks survive."""
+    times, values = _dropNaN(times, values)
+    count = len(values)
+    buckets = points // 2
+    if count <= points or buckets < 1:
+        return times, values
+    resultTimes = array('d')
+    resultValues = array('d')
+    for bucket in range(buckets):
+        start = bucket * count // buckets
+        stop = (bucket + 1) * count // buckets
+        minIndex = maxIndex = start
+        for i in range(start + 1, stop):
+            value = values[i]
+            if value < values[minIndex]:
+                minIndex = i
+            elif value > values[maxIndex]:
+                maxIndex = i
+        for i in sorted(set([ minIndex, maxIndex ])):
+            resultTimes.append(times[i])
+            resultValues.append(values[i])
+    return resultTimes, resultValues
+
+
+def lttb(times, values, points):
+    """Largest-Triangle-Three-Buckets: keeps the first and last sample and from
+    each of points - 2 buckets the one spanning the largest triangle with the
+    previous kept sample and the mean of the next bucket."""
+    times, values = _dropNaN(times, values)
+    count = len(values)
+    if count <= points or points < 3:
+        return times, values
+    resultTimes = array('d', [ times[0] ])
+    resultValues = array('d', [ values[0] ])
+    every = (count - 2) / float(points - 2)
+    previous = 0
+    for bucket in range(points - 2):
+        nextStart = int((bucket + 1) * every) + 1
+        nextStop = min(int((bucket + 2) * every) + 1, count)
+        nextCount = nextStop - nextStart
+        meanTime = sum(times[nextStart:nextStop]) / nextCount
+        meanValue = sum(values[nextStart:nextStop]) / nextCount
+        previousTime = times[previous]
+        previousValue = values[previous]
+        dt = previousTime - meanTime
+        dv = meanValue - previousValue
+        maxArea = -1.0
+        selected = start = int(bucket * every) + 1
+        for i in range(start, nextStart):
+            area = abs(dt * (values[i] - previousValue) - (previousTime - times[i]) * dv)
+            if area > maxArea:
+                maxArea = area
+                selected = i
+        resultTimes.append(times[selected])
+        resultValues.append(values[selected])
+        previous = selected
+    resultTimes.append(times[-1])
+    resultValues.append(values[-1])
+    return resultTimes, resultValues
+
+
+_DOWNSAMPLERS = {
+    'minmax':   minMaxBuckets,
+    'lttb':     lttb
+}
+
+
+class TimeSeries(object):
+    """Last `capacity` samples of fields that are updated together.
+
+    Struct of arrays: one preallocated array('d') ring per field, sharing the
+    time ring and write position, so a sample costs a few float stores and no
+    Python object stays alive per frame. None and non-numeric values are kept
+    as NaN.
+    """
+
+    def __init__(self, names, capacity):
+        self.names = list(names)
+        self.capacity = capacity
+        self.__getters = [ attrgetter(name) for name in self.names ]
+        self.clear()
+
+    def clear(self):
+        capacity = self.capacity
+        self.times = array('d', [ 0.0 ]) * capacity
+        self.__columns = [ array('d', [ NAN ]) * capacity for _ in self.names ]
+        self.columns = dict(zip(self.names, self.__columns))
+        self.__index = 0
+        self.count = 0
+
+    def push(self, time, stats):
+        index = self.__index
+        self.times[index] = time
+        for getter, column in zip(self.__getters, self.__columns):
+            try:
+                column[index] = getter(stats)
+            except (AttributeError, TypeError, ZeroDivisionError, ValueError):
+                column[index] = NAN
+        index += 1
+        self.__index = 0 if index == self.capacity else index
+        if self.count < self.capacity:
+            self.count += 1
+
+    @property
+    def lastTime(self):
+        if not self.count:
+            return None
+        return self.times[self.__index - 1]
+
+    def __ring(self, values, start, stop):
+        # logical [start, stop) of the oldest-first order to a copy of the ring
+        offset = self.__index - self.count
+        start += offset
+        stop += offset
+        if start < 0 <= stop:
+            return values[start:] + values[:stop]
+        return values[start:stop]
+
+    def __bisect(self, time):
+        # first logical index whose time is >= time
+        times = self.times
+        offset = self.__index - self.count
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if times[middle + offset] < time:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def indexRange(self, since=None, until=None):
+        start = self.__bisect(since) if since is not None else 0
+        stop = self.__bisect(until) if until is not None else self.count
+        return start, max(start, stop)
+
+    def slice(self, name, since=None, until=None):
+        """Returns (times, values) arrays of samples in [since, until)."""
+        start, stop = self.indexRange(since, until)
+        return self.__ring(self.times, start, stop), self.__ring(self.columns[name], start, stop)
+
+    def downsample(self, name, points, since=None, until=None, method='minmax'):
+        """Returns (times, values) with at most `points` samples in [since, until), NaN dropped."""
+        times, values = self.slice(name, since, until)
+        return _DOWNSAMPLERS[method](times, values, points)
+
+
+class HistoryStore(object):
+    """TimeSeries per collector event, holding the fields that event updates."""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.__seriesByEvent = {}
+        self.__seriesByName = {}
+
+    def setFields(self, namesByEvent, capacity):
+        self.clear()
+        for event, names in namesByEvent.items():
+            series = self.__seriesByEvent[event] = TimeSeries(names, capacity)
+            for name in names:
+                self.__seriesByName[name] = series
+
+    def push(self, event, time, stats):
+        series = self.__seriesByEvent.get(event, None)
+        if series is not None:
+            series.push(time, stats)
+
+    def get(self, name):
+        return self.__seriesByName.get(name, None)
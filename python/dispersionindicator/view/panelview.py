@@ -68,6 +68,17 @@ class PanelView(View):
         #_logger.debug('%s.as_setValueS: name=%s, value=%s', self.className, name, value)
         self.flashObject.as_setValue(name, value)
 
+    def as_setValuesS(self, values):
+        if not self.__wasPopulated:
+            return
+        #_logger.debug('%s.as_setValuesS: values=%s', self.className, values)
+        self.flashObject.as_setValues(values)
+
+    def as_setGraphS(self, name, points):
+        if not self.__wasPopulated:
+            return
+        self.flashObject.as_setGraph(name, points)
+
     def as_getPanelSizeS(self):
         _logger.debug('%s.as_getPanelSizeS', self.className)
         result = self.flashObject.as_getPanelSize()
@@ -2,13 +2,17 @@
 import logging
 import math
 import json
+import os
+import cPickle
+from hashlib import sha1
+from timeit import default_timer
 from collections import OrderedDict
 
 import ResMgr
 from debug_utils import LOG_CURRENT_EXCEPTION
 
 
-g_indicatorManager = None
+g_loader = None
 
 def getLogLevel(name):
     logLevel = {
@@ -23,24 +27,118 @@ def getLogLevel(name):
 
 def init():
     try:
+        startTime = default_timer()
         from gui.Scaleform.framework import g_entitiesFactories
         from dispersionindicator.mod_constants import MOD
-        from dispersionindicator.manager import IndicatorManager
+        from dispersionindicator.loader import LazyLoader
         from dispersionindicator.view.panelview import PANEL_VIEW_SETTINGS
 
         global _logger
         _logger = logging.getLogger(MOD.NAME)
         _logger.info('initialize: %s %s', MOD.PACKAGE_ID, MOD.VERSION)
-        settings = _readConfig()
+        settings = _loadSettings()
         logLevel = getLogLevel(settings['common'].get('logLevel', 'INFO'))
         _logger.setLevel(logLevel)
-        global g_indicatorManager
-        g_indicatorManager = IndicatorManager(settings)
+        global g_loader
+        g_loader = LazyLoader(settings)
         g_entitiesFactories.addSettings(PANEL_VIEW_SETTINGS)
+        _logger.info('initialize: done in %.1f ms', (default_timer() - startTime) * 1000.0)
     except:
         LOG_CURRENT_EXCEPTION()
 
 
+def _validationWindow(window):
+    from dispersionindicator.rollingwindow import AGGREGATES
+
+    if not isinstance(window, dict):
+        return False
+    size = window.get('size', None)
+    if isinstance(size, bool) or not isinstance(size, int) or size <= 0:
+        return False
+    return window.get('agg', 'mean') in AGGREGATES
+
+
+def _validationInterval(name, interval, default):
+    if interval is None:
+        return default
+    if isinstance(interval, bool) or not isinstance(interval, (int, float)) or interval <= 0:
+        _logger.error('invalid updateInterval: %s: %s' % (name, interval))
+        return default
+    return float(interval)
+
+
+def _validationHistory(history):
+    from dispersionindicator.mod_constants import CLIENT_STATUS_LIST
+
+    result = { 'capacity': 2048, 'items': [] }
+    if not isinstance(history, dict):
+        _logger.error('invalid history: %s' % history)
+        return result
+    capacity = history.get('capacity', result['capacity'])
+    if isinstance(capacity, bool) or not isinstance(capacity, int) or capacity <= 0:
+        _logger.error('invalid history capacity: %s' % capacity)
+    else:
+        result['capacity'] = capacity
+    items = history.get('items', [])
+    invalidItems = [ name for name in items if name not in CLIENT_STATUS_LIST ]
+    if invalidItems:
+        _logger.error('invalid history items: %s' % ', '.join(invalidItems))
+    result['items'] = [ name for name in items if name in CLIENT_STATUS_LIST ]
+    return result
+
+
+def _validationGraph(name, panelDef):
+    from dispersionindicator.timeseries import DOWNSAMPLE_METHODS
+
+    def toColor(rgb):
+        return (rgb[0] << 16) + (rgb[1] << 8) + rgb[2]
+
+    def number(key, default, cast):
+        value = graphDef.get(key, default)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+            _logger.error('invalid graph %s: %s: %s' % (key, name, value))
+            return default
+        return cast(value)
+
+    graphDef = panelDef.get('graph', {})
+    style = panelDef['style']
+    graph = {
+        'width':        number('width', 200, int),
+        'height':       number('height', 60, int),
+        'lineWidth':    number('lineWidth', 1, float),
+        'duration':     number('duration', 10.0, float),
+        'points':       number('points', 100, int),
+        'downsample':   graphDef.get('downsample', 'lttb'),
+        'frameColor':   toColor(graphDef.get('frameColor', style['textColor'])),
+        'series':       []
+    }
+    if graph['downsample'] not in DOWNSAMPLE_METHODS:
+        _logger.error('invalid graph downsample: %s: %s' % (name, graph['downsample']))
+        graph['downsample'] = 'lttb'
+    for item in panelDef['items']:
+        statDef = panelDef['statsDefs'].get(item, {})
+        series = { 'name': item, 'color': toColor(statDef.get('lineColor', style['textColor'])) }
+        valueRange = statDef.get('range', None)
+        if valueRange is not None:
+            if not isinstance(valueRange, list) or len(valueRange) != 2 or not valueRange[0] < valueRange[1]:
+                _logger.error('invalid graph range: %s: %s' % (item, valueRange))
+            else:
+                series['range'] = [ float(valueRange[0]), float(valueRange[1]) ]
+        graph['series'].append(series)
+    return graph
+
+
+def _validationExpression(name, expr):
+    from dispersionindicator.expression import ExpressionError, parseExpression
+
+    try:
+        parseExpression(expr)
+    except ExpressionError as e:
+        _logger.error('invalid expr: %s: %s' % (name, e))
+        return False
+    return True
+
+
 def _validationItems(items, statDefs):
     from dispersionindicator.mod_constants import CLIENT_STATUS_LIST
 
@@ -48,36 +146,134 @@ def _validationItems(items, statDefs):
     invalidItems = []
     for name in items:
         desc = statDefs.get(name, None) 
+        if desc is not None and 'expr' in desc:
+            if 'window' in desc or not _validationExpression(name, desc['expr']):
+                invalidItems.append(name)
+            else:
+                validItems.append(name)
+            continue
         statusName = desc['status'] if desc is not None else name
-        if statusName in CLIENT_STATUS_LIST:
-            validItems.append(name)
-        else:
+        if statusName not in CLIENT_STATUS_LIST:
             invalidItems.append(name)
+        elif desc is not None and 'window' in desc and not _validationWindow(desc['window']):
+            invalidItems.append(name)
+        else:
+            validItems.append(name)
     if invalidItems:
         _logger.error('invalid items: %s' % ', '.join(invalidItems))
     return validItems
 
-def _readConfig():
-    from dispersionindicator.mod_constants import CONFIG_FILES, EVENT_LIST
+def _readConfigFiles():
+    from dispersionindicator.mod_constants import CONFIG_FILES
+    sources = []
+    for file in CONFIG_FILES:
+        if not ResMgr.isFile(file):
+            continue
+        section = ResMgr.openSection(file)
+        sources.append((file, section.asString))
+    return sources
+
+
+def _getConfigKey(sources):
+    from dispersionindicator.mod_constants import MOD, CLIENT_STATUS_LIST, EVENT_LIST
+    digest = sha1(MOD.VERSION)
+    digest.update(repr(CLIENT_STATUS_LIST))
+    digest.update(repr(EVENT_LIST))
+    for file, data in sources:
+        digest.update(file)
+        digest.update(sha1(data).digest())
+    return digest.hexdigest()
+
+
+def _loadConfigCache(key):
+    from dispersionindicator.mod_constants import CONFIG_CACHE_FILE
+    if not os.path.isfile(CONFIG_CACHE_FILE):
+        return None
+    try:
+        with open(CONFIG_CACHE_FILE, 'rb') as fp:
+            cache = cPickle.load(fp)
+    except:
+        _logger.warning('config cache: broken file: %s', CONFIG_CACHE_FILE)
+        return None
+    if not isinstance(cache, dict) or cache.get('key', None) != key:
+        _logger.info('config cache: config changed')
+        return None
+    return cache
+
+
+def _toPlainDict(data, memo):
+    # OrderedDict unpickles several times slower than dict and no reader depends on the key order
+    result = memo.get(id(data), None)
+    if result is not None:
+        return result
+    if isinstance(data, dict):
+        result = memo[id(data)] = {}
+        for key, value in data.items():
+            result[key] = _toPlainDict(value, memo)
+    elif isinstance(data, list):
+        result = memo[id(data)] = []
+        result.extend(_toPlainDict(value, memo) for value in data)
+    else:
+        result = data
+    return result
+
+
+def _saveConfigCache(key, settings, buildTime):
+    from dispersionindicator.mod_constants import CONFIG_CACHE_FILE
+    cache = { 'key': key, 'settings': _toPlainDict(settings, {}), 'buildTime': buildTime }
+    tmpFile = CONFIG_CACHE_FILE + '.tmp'
+    try:
+        dirname = os.path.dirname(CONFIG_CACHE_FILE)
+        if dirname and not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        with open(tmpFile, 'wb') as fp:
+            cPickle.dump(cache, fp, cPickle.HIGHEST_PROTOCOL)
+        if os.path.isfile(CONFIG_CACHE_FILE):
+            os.remove(CONFIG_CACHE_FILE)
+        os.rename(tmpFile, CONFIG_CACHE_FILE)
+        _logger.info('config cache: save file: %s', CONFIG_CACHE_FILE)
+    except:
+        _logger.exception('config cache: failed to save: %s', CONFIG_CACHE_FILE)
+
+
+def _loadSettings():
+    startTime = default_timer()
+    sources = _readConfigFiles()
+    key = _getConfigKey(sources)
+    cache = _loadConfigCache(key)
+    if cache is not None:
+        loadTime = default_timer() - startTime
+        _logger.info('config cache: loaded in %.1f ms, saved %.1f ms of parsing',
+            loadTime * 1000.0, (cache['buildTime'] - loadTime) * 1000.0)
+        return cache['settings']
+    settings = _readConfig(sources)
+    buildTime = default_timer() - startTime
+    _logger.info('config: parsed in %.1f ms', buildTime * 1000.0)
+    _saveConfigCache(key, settings, buildTime)
+    return settings
+
+
+def _readConfig(sources=None):
+    from dispersionindicator.mod_constants import EVENT_LIST
     def encode_key(data):
         ascii_encode = lambda x: x.encode('ascii') if isinstance(x, unicode) else x
         return OrderedDict([ (ascii_encode(key), value) for key, value in data ])
 
     config = OrderedDict([ ('default', OrderedDict()), ('statsDefs', OrderedDict()) ])
-    
-    for file in CONFIG_FILES:
-        if not ResMgr.isFile(file):
-            continue
+
+    if sources is None:
+        sources = _readConfigFiles()
+    for file, text in sources:
         _logger.info('load config file: %s', file)
-        section = ResMgr.openSection(file)
-        data = json.loads(section.asString, object_pairs_hook=encode_key)
+        data = json.loads(text, object_pairs_hook=encode_key)
         config['default'].update(data.get('default', {}))
         config['statsDefs'].update(data.get('statsDefs', {}))
         config['panelDefs'] = OrderedDict()
         panels = data.get('panels', OrderedDict())
         for name, panelDef in panels.items():
             panelDef['name'] = name
-            panelDef['channel'] = 'indicator'
+            if panelDef.get('channel', None) != 'graph':
+                panelDef['channel'] = 'indicator'
             config['panelDefs'][name] = panelDef
         loggers = data.get('loggers', {})
         for name, panelDef in loggers.items():
@@ -90,6 +286,8 @@ def _readConfig():
     settings = { 'common': {}, 'panelDefs': [] }
     settings['common']['logLevel'] = config['default']['logLevel']
     settings['common']['updateInterval'] = config['default']['updateInterval']
+    settings['common']['profile'] = config['default'].get('profile', False)
+    settings['common']['history'] = _validationHistory(config['default'].get('history', {}))
 
     for name, panelDef in config['panelDefs'].items():
         settings['panelDefs'].append(panelDef)
@@ -98,13 +296,16 @@ def _readConfig():
         statsDefs.update(panelDef.get('statsDefs', {}))
         panelDef['statsDefs'] = statsDefs
         panelDef['items'] = _validationItems(panelDef['items'], statsDefs)
-        if panelDef['channel'] == 'indicator':
+        panelDef['updateInterval'] = _validationInterval(name, panelDef.get('updateInterval', None), settings['common']['updateInterval'])
+        if panelDef['channel'] == 'indicator' or panelDef['channel'] == 'graph':
             style = {}
             style.update(config['default'])
             style.update(panelDef.get('style', {}))
             panelDef['style'] = style
         elif panelDef['channel'] == 'event' or panelDef['channel'] == 'indicator':
             panelDef['events'] = [ e for e in EVENT_LIST if e in panelDef.get('events', []) ]
+        if panelDef['channel'] == 'graph':
+            panelDef['graph'] = _validationGraph(name, panelDef)
     #print json.dumps(settings, indent=2)
 
     return settings
@@ -0,0 +1,254 @@
+"""Aggregates recorded status logs per vehicle and per map.
+
+Every header block of a log (one battle) is parsed into NumPy columns in a
+worker process and reduced to mergeable aggregates (counts, sums and fixed
+bin histograms), so only one battle per worker is held in memory whatever
+the size of the archive. The merged aggregates are written as one CSV table.
+
+usage: python utils/analyzer.py [-j JOBS] [-g vehicle|arena|vehicle,arena] [-o SUMMARY.csv] PATH...
+
+PATH is a .csv or .dilog file (gzipped rotation segments too) or a directory
+searched recursively.
+Requires numpy.
+"""
+import os
+import re
+import sys
+import csv
+import gzip
+import argparse
+import multiprocessing
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'python'))
+from dispersionindicator import binarylog
+
+COMPRESSED_EXTENSION = '.gz'
+LOG_EXTENSIONS = ('.csv', binarylog.FILE_EXTENSION, '.csv' + COMPRESSED_EXTENSION, binarylog.FILE_EXTENSION + COMPRESSED_EXTENSION)
+
+_HEADER_PATTERN = re.compile(r'(\w+)=(\S+)')
+
+
+class Histogram(object):
+    """Counts, sum and fixed bins of one column; mergeable across processes."""
+
+    def __init__(self, edges):
+        self.edges = edges
+        self.counts = np.zeros(len(edges) + 1, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, values):
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.counts += np.bincount(np.searchsorted(self.edges, values, side='right'), minlength=len(self.counts))
+        self.count += len(values)
+        self.total += float(values.sum())
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.count += other.count
+        self.total += other.total
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else float('nan')
+
+    def percentile(self, q):
+        """Upper edge of the bin holding the q-th percentile."""
+        if not self.count:
+            return float('nan')
+        index = int(np.searchsorted(np.cumsum(self.counts), self.count * q / 100.0, side='left'))
+        return float(self.edges[min(index, len(self.edges) - 1)])
+
+
+def _shotMask(columns):
+    # rows of shots: actionShoot events in event logs, the frame of a shot in status logs
+    if 'eventName' in columns:
+        return columns['eventName'] == 'actionShoot'
+    if 'shotFactor' in columns:
+        return columns['shotFactor'] > 0.0
+    return None
+
+
+# name, source column, bins, row filter, reported percentiles
+METRICS = [
+    ('aimingTimeConvergingAtShot',  'aimingTimeConverging', np.linspace(0.0, 10.0, 1001),   _shotMask,  []),
+    ('dAngleAiming',                'dAngleAiming',         np.logspace(-4.0, 0.0, 401),    None,       [ 10, 50, 90 ]),
+    ('ping',                        'ping',                 np.arange(0.0, 2001.0),         None,       [ 50, 95, 99 ]),
+    ('fps',                         'fps',                  np.arange(0.0, 501.0),          None,       [ 1, 5, 50 ])
+]
+
+GROUP_KEYS = {
+    'vehicle':          lambda key: (key[0], ),
+    'arena':            lambda key: (key[1], ),
+    'vehicle,arena':    lambda key: key
+}
+
+
+class Aggregate(object):
+    def __init__(self):
+        self.battles = 0
+        self.rows = 0
+        self.metrics = dict((name, Histogram(edges)) for name, _, edges, _, _ in METRICS)
+
+    def addBattle(self, columns, rowCount):
+        self.battles += 1
+        self.rows += rowCount
+        for name, source, _, rowFilter, _ in METRICS:
+            values = columns.get(source, None)
+            if values is None or values.dtype.kind != 'f':
+                continue
+            if rowFilter is not None:
+                mask = rowFilter(columns)
+                if mask is None:
+                    continue
+                values = values[mask]
+            self.metrics[name].add(values)
+
+    def merge(self, other):
+        self.battles += other.battles
+        self.rows += other.rows
+        for name, histogram in other.metrics.items():
+            self.metrics[name].merge(histogram)
+
+
+def _toArray(values):
+    try:
+        return np.array([ float(value) if value not in ('', None) else np.nan for value in values ], dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.array(values, dtype=object)
+
+
+def _parseComment(comment):
+    info = dict(_HEADER_PATTERN.findall(comment or ''))
+    return info.get('vehicle', 'unknown'), info.get('arena', 'unknown')
+
+
+def _openCsv(path):
+    if path.endswith(COMPRESSED_EXTENSION):
+        return gzip.open(path, 'rb') if sys.version_info[0] == 2 else gzip.open(path, 'rt', newline='')
+    return open(path, 'rU') if sys.version_info[0] == 2 else open(path, 'r', newline='')
+
+
+def _iterCsvBattles(path):
+    """Yields ((vehicle, arena), names, rows) per header block of a StatsLogger/EventLogger CSV."""
+    with _openCsv(path) as fp:
+        key = names = None
+        rows = []
+        for row in csv.reader(fp):
+            if not row:
+                continue
+            if row[0].startswith('#'):
+                if len(row) == 1:
+                    if names is not None:
+                        yield key, names, rows
+                    key, names, rows = _parseComment(row[0]), None, []
+                elif names is None:
+                    names = row[1:]
+                continue
+            if names is not None:
+                rows.append(row[1:] if row[0] == '' else row)
+        if names is not None:
+            yield key, names, rows
+
+
+def _iterBinaryBattles(path):
+    with (gzip.open(path, 'rb') if path.endswith(COMPRESSED_EXTENSION) else open(path, 'rb')) as fp:
+        current = None
+        columns = None
+        for header, blockColumns in binarylog.iterBlocks(fp):
+            if header is not current:
+                if current is not None:
+                    yield (current.get('vehicleName') or 'unknown', current.get('arenaName') or 'unknown'), current['names'], list(zip(*columns))
+                current = header
+                columns = [ [] for _ in header['names'] ]
+            for column, values in zip(columns, blockColumns):
+                column.extend(values)
+        if current is not None:
+            yield (current.get('vehicleName') or 'unknown', current.get('arenaName') or 'unknown'), current['names'], list(zip(*columns))
+
+
+def analyzeFile(path):
+    """Returns {(vehicle, arena): Aggregate} for one log file."""
+    aggregates = {}
+    isBinary = path.endswith((binarylog.FILE_EXTENSION, binarylog.FILE_EXTENSION + COMPRESSED_EXTENSION))
+    battles = _iterBinaryBattles(path) if isBinary else _iterCsvBattles(path)
+    try:
+        for key, names, rows in battles:
+            rows = [ row for row in rows if len(row) == len(names) ]
+            columns = dict((name, _toArray(values)) for name, values in zip(names, zip(*rows))) if rows else {}
+            aggregate = aggregates.get(key, None)
+            if aggregate is None:
+                aggregate = aggregates[key] = Aggregate()
+            aggregate.addBattle(columns, len(rows))
+    except Exception as e:
+        sys.stderr.write('{}: {}\n'.format(path, e))
+    return aggregates
+
+
+def findLogs(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _, filenames in os.walk(path):
+                for filename in sorted(filenames):
+                    if filename.endswith(LOG_EXTENSIONS):
+                        yield os.path.join(dirpath, filename)
+        else:
+            yield path
+
+
+def summarize(paths, jobs=None, groupBy='vehicle,arena'):
+    groupKey = GROUP_KEYS[groupBy]
+    results = {}
+    pool = multiprocessing.Pool(jobs)
+    try:
+        for aggregates in pool.imap_unordered(analyzeFile, findLogs(paths), chunksize=4):
+            for key, aggregate in aggregates.items():
+                key = groupKey(key)
+                if key in results:
+                    results[key].merge(aggregate)
+                else:
+                    results[key] = aggregate
+    finally:
+        pool.close()
+        pool.join()
+    return results
+
+
+def writeSummary(results, groupBy, output):
+    header = groupBy.split(',') + [ 'battles', 'rows' ]
+    for name, _, _, _, percentiles in METRICS:
+        header += [ name + '_count', name + '_mean' ] + [ '{}_p{}'.format(name, q) for q in percentiles ]
+    writer = csv.writer(output)
+    writer.writerow(header)
+    for key in sorted(results):
+        aggregate = results[key]
+        row = list(key) + [ aggregate.battles, aggregate.rows ]
+        for name, _, _, _, percentiles in METRICS:
+            histogram = aggregate.metrics[name]
+            row += [ histogram.count, '{:.6g}'.format(histogram.mean) ]
+            row += [ '{:.6g}'.format(histogram.percentile(q)) for q in percentiles ]
+        writer.writerow(row)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Aggregates status logs per vehicle and per map.')
+    parser.add_argument('paths', nargs='+', help='log files or directories')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes (default: cpu count)')
+    parser.add_argument('-g', '--group-by', default='vehicle,arena', choices=sorted(GROUP_KEYS))
+    parser.add_argument('-o', '--output', default=None, help='summary CSV (default: stdout)')
+    args = parser.parse_args(argv[1:])
+    results = summarize(args.paths, args.jobs, args.group_by)
+    if args.output is None:
+        writeSummary(results, args.group_by, sys.stdout)
+    else:
+        with (open(args.output, 'wb') if sys.version_info[0] == 2 else open(args.output, 'w', newline='')) as fp:
+            writeSummary(results, args.group_by, fp)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,57 @@
+"""Converts binary status logs (.dilog) back to the CSV layout of StatsLogger.
+
+usage: python utils/dilog2csv.py FILE.dilog[.gz] [OUTPUT.csv]
+"""
+import os
+import sys
+import csv
+import gzip
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'python'))
+from dispersionindicator import binarylog
+
+
+def _text(value):
+    if sys.version_info[0] == 2 and isinstance(value, unicode):
+        return value.encode('utf-8')
+    return value
+
+
+def _openOutput(path):
+    if sys.version_info[0] == 2:
+        return open(path, 'wb')
+    return open(path, 'w', newline='')
+
+
+def convert(src, dst):
+    rows = 0
+    with (gzip.open(src, 'rb') if src.endswith('.gz') else open(src, 'rb')) as fin, _openOutput(dst) as fout:
+        writer = csv.writer(fout, dialect='excel')
+        current = None
+        for header, columns in binarylog.iterBlocks(fin):
+            if header is not current:
+                current = header
+                comment = header.get('comment') or '# vehicle={} arena={}'.format(header['vehicleName'], header['arenaName'])
+                writer.writerow([ _text(comment) ])
+                writer.writerow([ '#' ] + [ _text(name) for name in header['names'] ])
+                writer.writerow([ '#' ] + [ _text(unit) for unit in header['units'] ])
+            for row in zip(*columns):
+                writer.writerow([ '' ] + [ '' if value is None else _text(value) for value in row ])
+                rows += 1
+    return rows
+
+
+def main(argv):
+    if len(argv) not in (2, 3):
+        sys.stderr.write(__doc__)
+        return 2
+    src = argv[1]
+    base = src[:-len('.gz')] if src.endswith('.gz') else src
+    dst = argv[2] if len(argv) == 3 else os.path.splitext(base)[0] + '.csv'
+    rows = convert(src, dst)
+    print('{}: {} rows -> {}'.format(src, rows, dst))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
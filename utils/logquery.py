@@ -0,0 +1,129 @@
+"""Selects recorded logs from the log index (index.jsonl in the log directory).
+
+Only the index is read, never the log files. Battles of a rotated log are
+listed under the segment they were moved to.
+
+usage: python utils/logquery.py [options] INDEX
+    INDEX       index.jsonl or the log directory holding it
+
+options:
+    --vehicle PATTERN   vehicle name, shell-style pattern, case-insensitive (e.g. '*Object_140*')
+    --arena PATTERN     arena name pattern
+    --channel NAME      status or event
+    --since DATE        recorded at or after DATE (YYYY-MM-DD[ HH:MM[:SS]])
+    --until DATE        recorded before DATE
+    --column NAME       log has this column (repeatable)
+    --min-rows N        log has at least N rows
+    -l, --files         print only the matching file names, once each
+    --json              print the matching records as JSON lines
+"""
+import os
+import sys
+import json
+import argparse
+from fnmatch import fnmatch
+
+INDEX_FILE = 'index.jsonl'
+
+
+def iterRecords(path):
+    if os.path.isdir(path):
+        path = os.path.join(path, INDEX_FILE)
+    with open(path, 'rb') as fp:
+        for line in fp:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line.decode('utf-8'))
+            except ValueError:
+                # a line cut short by a crash while it was appended
+                continue
+
+
+def resolveSegments(records):
+    """Points records at the segment their file was rotated to later in the index."""
+    result = []
+    live = {}
+    for record in records:
+        if record.get('channel') == 'rotate':
+            for entry in live.pop(record['file'], []):
+                entry['file'] = record['segment']
+            continue
+        result.append(record)
+        live.setdefault(record['file'], []).append(record)
+    return result
+
+
+def _normalizeDate(text):
+    return text if len(text) > 10 else text + ' 00:00:00'
+
+
+def _match(pattern, value):
+    return fnmatch((value or '').lower(), pattern.lower())
+
+
+def makeFilter(args):
+    since = _normalizeDate(args.since) if args.since else None
+    until = _normalizeDate(args.until) if args.until else None
+    def accept(record):
+        if args.vehicle and not _match(args.vehicle, record.get('vehicle')):
+            return False
+        if args.arena and not _match(args.arena, record.get('arena')):
+            return False
+        if args.channel and record.get('channel') != args.channel:
+            return False
+        if since and record.get('date', '') < since:
+            return False
+        if until and record.get('date', '') >= until:
+            return False
+        if args.min_rows and record.get('rows', 0) < args.min_rows:
+            return False
+        columns = record.get('columns', [])
+        return all(column in columns for column in args.column)
+    return accept
+
+
+def _duration(record):
+    if record.get('startTime') is None or record.get('endTime') is None:
+        return ''
+    return '{:.1f}'.format(record['endTime'] - record['startTime'])
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Selects recorded logs from the log index.')
+    parser.add_argument('index', help='index.jsonl or the log directory')
+    parser.add_argument('--vehicle')
+    parser.add_argument('--arena')
+    parser.add_argument('--channel', choices=[ 'status', 'event' ])
+    parser.add_argument('--since')
+    parser.add_argument('--until')
+    parser.add_argument('--column', action='append', default=[])
+    parser.add_argument('--min-rows', type=int, default=0)
+    parser.add_argument('-l', '--files', action='store_true')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv[1:])
+
+    accept = makeFilter(args)
+    records = [ record for record in resolveSegments(iterRecords(args.index)) if accept(record) ]
+    if args.files:
+        seen = set()
+        for record in records:
+            if record['file'] not in seen:
+                seen.add(record['file'])
+                print(record['file'])
+    elif args.json:
+        for record in records:
+            print(json.dumps(record, sort_keys=True))
+    else:
+        print('{:19s}  {:7s}  {:32s}  {:24s}  {:>8s}  {:>8s}  {:>10s}  {}'.format(
+            'date', 'channel', 'vehicle', 'arena', 'rows', 'time(s)', 'bytes', 'file'))
+        for record in records:
+            print('{:19s}  {:7s}  {:32s}  {:24s}  {:8d}  {:>8s}  {:10d}  {}'.format(
+                record.get('date', ''), record.get('channel', ''), record.get('vehicle') or '', record.get('arena') or '',
+                record.get('rows', 0), _duration(record), record.get('bytes', 0), record.get('file', '')))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))